@@ -4,9 +4,10 @@ Chat RAG (Retrieval Augmented Generation) Agent Module
 This module implements a chat agent that uses RAG to enhance responses with sales data.
 """
 
+from collections import deque
 from datetime import timedelta
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field, validator
+from typing import Annotated, Deque, List, Optional, Dict, Any, Type, TypeVar
+import msgspec
 from restack_ai.agent import agent, import_functions, log
 from restack_ai.agent.exceptions import (
     AgentError,
@@ -47,25 +48,56 @@ class SalesLookupError(AgentRagError):
     """Exception raised when sales data lookup fails."""
     pass
 
-class MessageEvent(BaseModel):
+class MessageEvent(msgspec.Struct, frozen=True):
     """Event model for incoming chat messages."""
-    content: str = Field(..., min_length=1)
+    content: Annotated[str, msgspec.Meta(min_length=1)]
 
-    @validator("content")
-    def validate_content(cls, v: str) -> str:
+    def __post_init__(self) -> None:
         """Validate message content is not just whitespace."""
-        if v.strip() == "":
+        if self.content.strip() == "":
             raise ValueError("Message content cannot be empty or whitespace")
-        return v
 
-class EndEvent(BaseModel):
+class EndEvent(msgspec.Struct, frozen=True):
     """Event model for ending the chat session."""
-    end: bool = Field(...)
+    end: bool
 
-class AgentInput(BaseModel):
+class AgentInput(msgspec.Struct, frozen=True):
     """Input model for agent initialization."""
-    max_history: Optional[int] = Field(default=MAX_MESSAGE_HISTORY)
-    system_prompt: Optional[str] = Field(default=SYSTEM_PROMPT)
+    max_history: Optional[int] = MAX_MESSAGE_HISTORY
+    system_prompt: Optional[str] = SYSTEM_PROMPT
+
+# Decoders are reusable, so build them once per schema
+_DECODERS = {
+    model: msgspec.json.Decoder(model)
+    for model in (MessageEvent, EndEvent, AgentInput)
+}
+
+EventT = TypeVar("EventT", MessageEvent, EndEvent, AgentInput)
+
+# Restack's data converter only handles JSON-native values and pydantic models, so handlers
+# take and return plain dicts, validated into structs here and encoded with msgspec.to_builtins
+def _validate(payload: Any, model: Type[EventT]) -> EventT:
+    """
+    Validate a raw payload against an event model.
+    
+    Args:
+        payload: Model instance, JSON bytes/str, or a mapping of fields
+        model: Target msgspec model
+        
+    Returns:
+        The validated model instance
+        
+    Raises:
+        AgentValidationError: If the payload does not match the model
+    """
+    if isinstance(payload, model):
+        return payload
+    try:
+        if isinstance(payload, (bytes, bytearray, str)):
+            return _DECODERS[model].decode(payload)
+        return msgspec.convert(payload, model)
+    except msgspec.ValidationError as e:
+        raise AgentValidationError(str(e)) from e
 
 @agent.defn()
 class AgentRag:
@@ -81,10 +113,13 @@ class AgentRag:
     def __init__(self) -> None:
         """Initialize the agent with empty message history."""
         self.end: bool = False
-        self.messages: List[Message] = []
-        self._sales_cache: Optional[SalesData] = None
         self._max_history: int = MAX_MESSAGE_HISTORY
+        self.messages: Deque[Message] = deque(maxlen=self._max_history)
+        self._message_pool: List[Message] = []
+        self._sales_cache: Optional[SalesData] = None
         self._system_prompt: str = SYSTEM_PROMPT
+        self._formatted_system: Optional[str] = None
+        self._formatted_sales: Optional[SalesData] = None
 
     @retry(
         retries=MAX_RETRIES,
@@ -116,10 +151,35 @@ class AgentRag:
 
         return self._sales_cache
 
-    def _trim_message_history(self) -> None:
-        """Maintain message history within configured size limits."""
-        while len(self.messages) > self._max_history:
-            self.messages.pop(0)
+    def _append_message(self, role: str, content: str) -> None:
+        """
+        Append a message to history, recycling the evicted message if the history is full.
+        
+        Messages handed to llm_chat or returned from an event are serialized at that
+        point, so reusing evicted instances does not affect earlier results.
+        """
+        if self.messages.maxlen is not None and len(self.messages) >= self.messages.maxlen:
+            self._message_pool.append(self.messages.popleft())
+
+        if self._message_pool:
+            msg = self._message_pool.pop()
+            msg.role = role
+            msg.content = content
+        else:
+            msg = Message(role=role, content=content)
+        self.messages.append(msg)
+
+    def _get_system_content(self, sales_info: SalesData) -> str:
+        """
+        Format the system prompt, reusing the last result while the sales payload is unchanged.
+        
+        _get_sales_info hands back the same cached object every turn, so identity is enough;
+        the payload is held so its id cannot be reused by a later object.
+        """
+        if self._formatted_system is None or sales_info is not self._formatted_sales:
+            self._formatted_system = self._system_prompt.format(sales_info=sales_info)
+            self._formatted_sales = sales_info
+        return self._formatted_system
 
     @retry(
         retries=MAX_RETRIES,
@@ -144,7 +204,7 @@ class AgentRag:
         try:
             completion = await agent.step(
                 llm_chat,
-                self.messages,
+                list(self.messages),
                 system_content,
                 start_to_close_timeout=CHAT_COMPLETION_TIMEOUT,
             )
@@ -162,12 +222,12 @@ class AgentRag:
             raise MessageProcessingError("Unexpected error generating response") from e
 
     @agent.event
-    async def message(self, message: MessageEvent) -> List[Message]:
+    async def message(self, message: Dict[str, Any]) -> List[Message]:
         """
         Handle incoming chat messages.
         
         Args:
-            message: The incoming message event
+            message: The incoming message event fields, validated as a MessageEvent
             
         Returns:
             List[Message]: Updated message history
@@ -176,15 +236,15 @@ class AgentRag:
             MessageProcessingError: If message processing fails
         """
         try:
+            message = _validate(message, MessageEvent)
             log.info(f"Processing message: {message.content}")
 
             # Get sales context
             sales_info = await self._get_sales_info()
-            system_content = self._system_prompt.format(sales_info=sales_info)
+            system_content = self._get_system_content(sales_info)
 
             # Add user message
-            self.messages.append(Message(role="user", content=message.content))
-            self._trim_message_history()
+            self._append_message("user", message.content)
 
             # Generate and process completion
             completion = await self._generate_completion(system_content)
@@ -193,13 +253,11 @@ class AgentRag:
             log.info(f"Generated response: {assistant_message}")
 
             # Add assistant response
-            self.messages.append(
-                Message(role="assistant", content=assistant_message or "")
-            )
+            self._append_message("assistant", assistant_message or "")
 
-            return self.messages
+            return list(self.messages)
 
-        except (SalesLookupError, MessageProcessingError) as e:
+        except (AgentValidationError, SalesLookupError, MessageProcessingError) as e:
             log.error(f"Error in message handler: {str(e)}")
             raise
         except Exception as e:
@@ -207,19 +265,20 @@ class AgentRag:
             raise MessageProcessingError(f"Chat processing error: {str(e)}") from e
 
     @agent.event
-    async def end(self, end: EndEvent) -> EndEvent:
+    async def end(self, end: Dict[str, Any]) -> Dict[str, Any]:
         """
         Handle chat end event.
         
         Args:
-            end: The end event
+            end: The end event fields, validated as an EndEvent
             
         Returns:
-            EndEvent: Confirmation of end status
+            Dict[str, Any]: Confirmation of end status as EndEvent fields
         """
+        _validate(end, EndEvent)
         log.info("Ending chat session")
         self.end = True
-        return EndEvent(end=True)
+        return msgspec.to_builtins(EndEvent(end=True))
 
     @agent.run
     async def run(self, input: Optional[Dict[str, Any]] = None) -> None:
@@ -234,10 +293,12 @@ class AgentRag:
         try:
             # Validate and process input
             if input:
-                validated_input = AgentInput(**input)
+                validated_input = _validate(input, AgentInput)
                 self._max_history = validated_input.max_history
+                self.messages = deque(self.messages, maxlen=self._max_history)
                 if validated_input.system_prompt:
                     self._system_prompt = validated_input.system_prompt
+                    self._formatted_system = None
 
             log.info(
                 f"Starting chat agent (max_history={self._max_history})"
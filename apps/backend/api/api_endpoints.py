@@ -1,12 +1,24 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, Response
+from fastapi.responses import ORJSONResponse
 from typing import Dict, Any, List, Optional
 import asyncio
+import itertools
+import json
+import secrets
+from contextlib import asynccontextmanager
+import msgspec
+import orjson
+from cachetools import TTLCache
 from datetime import datetime
+from functools import lru_cache
 import uvicorn
+from apscheduler.triggers.cron import CronTrigger
+from sqlalchemy import text
+from apps.backend.core.connections import get_db_session, lifespan
 from src.functions.market_analysis import (
     analyze_market_trends,
-    analyze_competitor_data
+    analyze_competitor_data,
+    analyze_customer_data
 )
 from src.functions.data_collection import (
     collect_pos_data,
@@ -18,54 +30,106 @@ from src.functions.bi_analytics import (
     generate_operational_metrics
 )
 
-app = FastAPI(title="Restaurant BI System API")
+# Background task outcomes, written by store_task_result/store_task_error and read by check_task_status
+TASK_RESULTS_DDL = """
+CREATE TABLE IF NOT EXISTS task_results (
+    task_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    result JSONB,
+    error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+)
+"""
+
+async def create_task_results_table():
+    """Create the task_results table if it does not exist yet"""
+    async with get_db_session() as session:
+        await session.execute(text(TASK_RESULTS_DDL))
+        await session.commit()
+
+@asynccontextmanager
+async def api_lifespan(app: FastAPI):
+    """Shared connection lifespan plus the API's own schema setup"""
+    async with lifespan(app):
+        await create_task_results_table()
+        yield
+
+app = FastAPI(
+    title="Restaurant BI System API",
+    lifespan=api_lifespan,
+    default_response_class=ORJSONResponse
+)
 
-class AnalysisRequest(BaseModel):
+class AnalysisRequest(msgspec.Struct):
     location: Dict[str, float]
     data_type: str
     parameters: Optional[Dict[str, Any]] = None
 
-class ScheduleRequest(BaseModel):
+class ScheduleRequest(msgspec.Struct):
     task_name: str
     schedule: str  # cron format
     parameters: Optional[Dict[str, Any]] = None
 
-class TaskResponse(BaseModel):
+class TaskResponse(msgspec.Struct):
     task_id: str
     status: str
-    created_at: str
+    created_at: datetime
     task_type: str
 
+# Decoders/encoder are built once so per-request parsing is a single call
+_analysis_decoder = msgspec.json.Decoder(AnalysisRequest)
+_schedule_decoder = msgspec.json.Decoder(ScheduleRequest)
+_encoder = msgspec.json.Encoder()
+
+async def _decode_body(http_request: Request, decoder: msgspec.json.Decoder):
+    """Decode a request body, mapping validation failures to a 422"""
+    try:
+        return decoder.decode(await http_request.body())
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+_task_counter = itertools.count()
+
+def _make_task_id(prefix: str) -> str:
+    """Build a unique task id from a process-wide counter and a random suffix"""
+    return f"{prefix}_{next(_task_counter):x}_{secrets.token_hex(3)}"
+
+def _task_response(task: TaskResponse) -> Response:
+    """Encode a task response without going through jsonable_encoder"""
+    return Response(content=_encoder.encode(task), media_type="application/json")
+
 # API Routes
-@app.post("/api/v1/analysis", response_model=TaskResponse)
-async def trigger_analysis(request: AnalysisRequest, background_tasks: BackgroundTasks):
+@app.post("/api/v1/analysis")
+async def trigger_analysis(http_request: Request, background_tasks: BackgroundTasks):
     """Trigger a new analysis task"""
+    request = await _decode_body(http_request, _analysis_decoder)
     try:
-        task_id = f"analysis_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        task_id = _make_task_id("analysis")
         background_tasks.add_task(run_analysis, task_id, request)
         
-        return {
-            "task_id": task_id,
-            "status": "scheduled",
-            "created_at": datetime.now().isoformat(),
-            "task_type": request.data_type
-        }
+        return _task_response(TaskResponse(
+            task_id=task_id,
+            status="scheduled",
+            created_at=datetime.now(),
+            task_type=request.data_type
+        ))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/v1/schedule", response_model=TaskResponse)
-async def schedule_task(request: ScheduleRequest):
+@app.post("/api/v1/schedule")
+async def schedule_task(http_request: Request):
     """Schedule a recurring task"""
+    request = await _decode_body(http_request, _schedule_decoder)
     try:
-        task_id = f"scheduled_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        task_id = _make_task_id("scheduled")
         await schedule_recurring_task(task_id, request)
         
-        return {
-            "task_id": task_id,
-            "status": "scheduled",
-            "created_at": datetime.now().isoformat(),
-            "task_type": request.task_name
-        }
+        return _task_response(TaskResponse(
+            task_id=task_id,
+            status="scheduled",
+            created_at=datetime.now(),
+            task_type=request.task_name
+        ))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -78,23 +142,38 @@ async def get_task_status(task_id: str):
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
 
+# Liveness probes hit this at high frequency, so the body is reused for a second
+_health_cache: TTLCache = TTLCache(maxsize=1, ttl=1)
+
 @app.get("/api/v1/health")
 async def health_check():
     """API health check endpoint"""
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    body = _health_cache.get("body")
+    if body is None:
+        body = orjson.dumps({"status": "healthy", "timestamp": datetime.now()})
+        _health_cache["body"] = body
+    return Response(content=body, media_type="application/json")
 
 # Task Execution Functions
+_ANALYSIS_HANDLERS = {
+    "market_analysis": analyze_market_trends,
+    "competitor_analysis": analyze_competitor_data,
+    "customer_analysis": analyze_customer_data
+}
+
+_SCHEDULED_TASKS = {
+    "collect_pos_data": collect_pos_data,
+    "collect_inventory": collect_inventory_data,
+    "generate_insights": generate_executive_insights
+}
+
 async def run_analysis(task_id: str, request: AnalysisRequest):
     """Run analysis task based on request type"""
     try:
-        if request.data_type == "market_analysis":
-            result = await analyze_market_trends(request.parameters)
-        elif request.data_type == "competitor_analysis":
-            result = await analyze_competitor_data(request.parameters)
-        elif request.data_type == "customer_analysis":
-            result = await analyze_customer_data(request.parameters)
-        else:
+        handler = _ANALYSIS_HANDLERS.get(request.data_type)
+        if handler is None:
             raise ValueError(f"Unknown analysis type: {request.data_type}")
+        result = await handler(request.parameters)
         
         await store_task_result(task_id, result)
         
@@ -103,36 +182,28 @@ async def run_analysis(task_id: str, request: AnalysisRequest):
 
 async def schedule_recurring_task(task_id: str, request: ScheduleRequest):
     """Schedule a recurring task"""
-    scheduler = get_scheduler()
-    
-    if request.task_name == "collect_pos_data":
-        scheduler.add_job(
-            collect_pos_data,
-            'cron',
-            **parse_cron_schedule(request.schedule),
-            args=[request.parameters]
-        )
-    elif request.task_name == "collect_inventory":
-        scheduler.add_job(
-            collect_inventory_data,
-            'cron',
-            **parse_cron_schedule(request.schedule),
-            args=[request.parameters]
-        )
-    elif request.task_name == "generate_insights":
-        scheduler.add_job(
-            generate_executive_insights,
-            'cron',
-            **parse_cron_schedule(request.schedule),
-            args=[request.parameters]
-        )
-    else:
+    task_func = _SCHEDULED_TASKS.get(request.task_name)
+    if task_func is None:
         raise ValueError(f"Unknown task type: {request.task_name}")
+    
+    scheduler = get_scheduler()
+    scheduler.add_job(
+        task_func,
+        trigger=_cron_trigger(request.schedule),
+        args=[request.parameters]
+    )
 
 async def check_task_status(task_id: str) -> Dict[str, Any]:
     """Check status of a task"""
-    # Implement task status checking
-    pass
+    async with get_db_session() as session:
+        result = await session.execute(
+            text("SELECT task_id, status, result, error FROM task_results WHERE task_id = :task_id"),
+            {"task_id": task_id}
+        )
+        row = result.mappings().first()
+    if row is None:
+        raise KeyError(task_id)
+    return dict(row)
 
 # Scheduler Setup
 def get_scheduler():
@@ -143,21 +214,29 @@ def get_scheduler():
     scheduler.start()
     return scheduler
 
-def parse_cron_schedule(schedule: str) -> Dict[str, Any]:
-    """Parse cron schedule string into scheduler parameters"""
-    # Implement cron string parsing
-    pass
+@lru_cache(maxsize=256)
+def _cron_trigger(expr: str) -> CronTrigger:
+    """Parse a crontab expression, reusing triggers for repeated schedules"""
+    return CronTrigger.from_crontab(expr)
 
 # Storage Functions
 async def store_task_result(task_id: str, result: Dict[str, Any]):
     """Store task result"""
-    # Implement result storage
-    pass
+    async with get_db_session() as session:
+        await session.execute(
+            text("INSERT INTO task_results (task_id, status, result) VALUES (:task_id, 'completed', :result)"),
+            {"task_id": task_id, "result": json.dumps(result, default=str)}
+        )
+        await session.commit()
 
 async def store_task_error(task_id: str, error: str):
     """Store task error"""
-    # Implement error storage
-    pass
+    async with get_db_session() as session:
+        await session.execute(
+            text("INSERT INTO task_results (task_id, status, error) VALUES (:task_id, 'failed', :error)"),
+            {"task_id": task_id, "error": error}
+        )
+        await session.commit()
 
 if __name__ == "__main__":
     uvicorn.run("api_endpoints:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
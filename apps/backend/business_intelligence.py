@@ -1,7 +1,18 @@
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Tuple
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import functools
+import os
+import time
+from joblib import Memory
+import numpy as np
 import pandas as pd
+from numba import njit, prange
 from sklearn.cluster import KMeans
+from statsmodels.tsa.arima.model import ARIMA
+from statsmodels.tsa.forecasting.stl import STLForecast
+os.environ.setdefault('STAN_BACKEND', 'CMDSTANPY')
 from prophet import Prophet
 from dataclasses import dataclass
 
@@ -22,6 +33,152 @@ async def collect_external_data() -> Dict[str, Any]:
     """Collect competitor pricing, event calendars, weather data"""
     pass
 
+# Initialize the Stan backend at import rather than on the first fit
+Prophet()
+
+# Fitted models are memoized on disk so all workers share them
+PROPHET_CACHE_DIR = os.getenv(
+    'PROPHET_CACHE_DIR',
+    os.path.join(os.getenv('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'bitebase', 'prophet')
+)
+PROPHET_CACHE_BYTES_LIMIT = 2 * 1024 ** 3
+
+def _fit_prophet(ds_tuple: tuple, y_tuple: tuple, yearly: bool, weekly: bool) -> Prophet:
+    """Fit a Prophet model on the given series"""
+    model = Prophet(yearly_seasonality=yearly, weekly_seasonality=weekly)
+    model.fit(pd.DataFrame({'ds': ds_tuple, 'y': y_tuple}))
+    return model
+
+@functools.lru_cache(maxsize=None)
+def _memoized_fit_prophet():
+    """_fit_prophet backed by the on-disk cache, which is created on first use rather than at import"""
+    memory = Memory(location=PROPHET_CACHE_DIR, verbose=0)
+    memory.reduce_size(bytes_limit=PROPHET_CACHE_BYTES_LIMIT)
+    return memory.cache(_fit_prophet)
+
+PROPHET_YEARLY_SEASONALITY = True
+PROPHET_WEEKLY_SEASONALITY = True
+
+def _fit_and_predict(ds_tuple: tuple, y_tuple: tuple, periods: int) -> pd.DataFrame:
+    """Fit (or load) a Prophet model and forecast `periods` days ahead; runs in a worker process"""
+    model = _memoized_fit_prophet()(ds_tuple, y_tuple, PROPHET_YEARLY_SEASONALITY, PROPHET_WEEKLY_SEASONALITY)
+    future = model.make_future_dataframe(periods=periods)
+    return model.predict(future)
+
+# Model fits run off the event loop, one worker per core
+_fit_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+
+# Forecast cache: (ds hash, y hash, periods) -> (fitted_at, forecast)
+FORECAST_CACHE_TTL = 3600  # seconds
+_forecast_cache: Dict[Tuple[int, int, int], Tuple[float, pd.DataFrame]] = {}
+
+async def _get_or_fit(
+    df: pd.DataFrame,
+    periods: int,
+    fit: Callable[[tuple, tuple, int], pd.DataFrame] = _fit_and_predict
+) -> pd.DataFrame:
+    """Return the forecast for a series from `fit` in a worker, reusing cached fits for identical series"""
+    ds_tuple, y_tuple = tuple(df['ds']), tuple(df['y'])
+    key = (hash(ds_tuple), hash(y_tuple), periods)
+    now = time.monotonic()
+
+    cached = _forecast_cache.get(key)
+    if cached and now - cached[0] < FORECAST_CACHE_TTL:
+        return cached[1]
+
+    # Drop expired entries before adding a new one
+    for stale_key in [k for k, v in _forecast_cache.items() if now - v[0] >= FORECAST_CACHE_TTL]:
+        del _forecast_cache[stale_key]
+
+    loop = asyncio.get_running_loop()
+    forecast = await loop.run_in_executor(_fit_pool, fit, ds_tuple, y_tuple, periods)
+
+    _forecast_cache[key] = (now, forecast)
+    return forecast
+
+# Short daily series skip Prophet for a much cheaper STL + ARIMA forecast
+PROPHET_MIN_HISTORY = 730  # days
+STL_PERIOD = 7
+
+def _fast_forecast(ds_tuple: tuple, y_tuple: tuple, periods: int) -> pd.DataFrame:
+    """Forecast a short daily series with STL decomposition and ARIMA(1,1,1); runs in a worker process"""
+    ds = pd.to_datetime(pd.Series(ds_tuple))
+    y = pd.Series(np.asarray(y_tuple, dtype=np.float64))
+
+    result = STLForecast(y, ARIMA, model_kwargs={'order': (1, 1, 1)}, period=STL_PERIOD).fit()
+    yhat = np.asarray(result.forecast(periods))
+    interval = 1.96 * float(np.std(result.model_result.resid))
+
+    return pd.DataFrame({
+        'ds': pd.date_range(ds.iloc[-1] + pd.Timedelta(days=1), periods=periods, freq='D'),
+        'yhat': yhat,
+        'yhat_lower': yhat - interval,
+        'yhat_upper': yhat + interval
+    })
+
+def _forecast_records(forecast: pd.DataFrame, periods: int) -> List[Dict[str, Any]]:
+    """Project the last `periods` forecast rows into records straight from the column arrays"""
+    tail = forecast.iloc[-periods:]
+    ds = tail['ds'].dt.strftime('%Y-%m-%dT%H:%M:%S').to_numpy()
+    yhat = tail['yhat'].to_numpy()
+    yhat_lower = tail['yhat_lower'].to_numpy()
+    yhat_upper = tail['yhat_upper'].to_numpy()
+    return [
+        {'ds': d, 'yhat': float(a), 'yhat_lower': float(b), 'yhat_upper': float(c)}
+        for d, a, b, c in zip(ds, yhat, yhat_lower, yhat_upper)
+    ]
+
+# Competitor clustering: small sets use the JIT kernel, large ones go to scikit-learn
+KMEANS_SKLEARN_THRESHOLD = 10_000
+KMEANS_MAX_ITER = 100
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _kmeans_lloyd(X: np.ndarray, k: int, n_iter: int) -> np.ndarray:
+    """Lloyd's k-means on a float32 matrix, returning cluster labels"""
+    n, d = X.shape
+    # Deterministic init: k evenly spaced rows
+    centroids = np.empty((k, d), dtype=X.dtype)
+    for j in range(k):
+        centroids[j] = X[(j * n) // k]
+    labels = np.zeros(n, dtype=np.int64)
+
+    for _ in range(n_iter):
+        changed = 0
+        for i in prange(n):
+            best = 0
+            best_dist = np.inf
+            for j in range(k):
+                dist = 0.0
+                for f in range(d):
+                    diff = X[i, f] - centroids[j, f]
+                    dist += diff * diff
+                if dist < best_dist:
+                    best_dist = dist
+                    best = j
+            if labels[i] != best:
+                labels[i] = best
+                changed += 1
+
+        sums = np.zeros((k, d), dtype=np.float64)
+        counts = np.zeros(k, dtype=np.int64)
+        for i in range(n):
+            counts[labels[i]] += 1
+            for f in range(d):
+                sums[labels[i], f] += X[i, f]
+        for j in range(k):
+            # Empty clusters keep their previous centroid
+            if counts[j] > 0:
+                for f in range(d):
+                    centroids[j, f] = sums[j, f] / counts[j]
+
+        if changed == 0:
+            break
+
+    return labels
+
+# Compile at import so the first request does not pay for it
+_kmeans_lloyd(np.zeros((2, 4), dtype=np.float32), 1, 1)
+
 # Market Analysis Functions
 @dataclass
 class MarketAnalysis:
@@ -35,18 +192,19 @@ async def analyze_market_trends(data: Dict[str, Any]) -> Dict[str, Any]:
     df = pd.DataFrame(data)
     df.columns = ['ds', 'y']
     
-    model = Prophet(yearly_seasonality=True, weekly_seasonality=True)
-    model.fit(df)
-    
-    future = model.make_future_dataframe(periods=90)
-    forecast = model.predict(future)
+    if 2 * STL_PERIOD <= len(df) < PROPHET_MIN_HISTORY:
+        forecast = await _get_or_fit(df, 90, _fast_forecast)
+        seasonal_patterns = {'yearly': False, 'weekly': True}
+    else:
+        forecast = await _get_or_fit(df, 90)
+        seasonal_patterns = {
+            'yearly': PROPHET_YEARLY_SEASONALITY,
+            'weekly': PROPHET_WEEKLY_SEASONALITY
+        }
     
     return {
-        'forecast': forecast.tail(90)[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].to_dict('records'),
-        'seasonal_patterns': {
-            'yearly': model.yearly_seasonality,
-            'weekly': model.weekly_seasonality
-        }
+        'forecast': _forecast_records(forecast, 90),
+        'seasonal_patterns': seasonal_patterns
     }
 
 async def analyze_competitor_data(competitors: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -54,15 +212,26 @@ async def analyze_competitor_data(competitors: List[Dict[str, Any]]) -> Dict[str
     if not competitors:
         return {}
         
-    features = pd.DataFrame([{
-        'price_range': float(c['price_range'].count('$')),
-        'ratings': c['ratings'],
-        'lat': c['location']['lat'],
-        'lng': c['location']['lng']
-    } for c in competitors])
+    n = len(competitors)
+    price_ranges = [''] * n
+    ratings = np.empty(n, dtype=np.float32)
+    lat = np.empty(n, dtype=np.float32)
+    lng = np.empty(n, dtype=np.float32)
+    for i, c in enumerate(competitors):
+        price_ranges[i] = c['price_range']
+        ratings[i] = c['ratings']
+        lat[i] = c['location']['lat']
+        lng[i] = c['location']['lng']
+    # Count '$' for every competitor in one vectorized string pass
+    prices = np.char.count(np.array(price_ranges, dtype=str), '$').astype(np.float32)
+    features = np.column_stack([prices, ratings, lat, lng])
     
-    kmeans = KMeans(n_clusters=min(len(competitors), 5))
-    clusters = kmeans.fit_predict(features)
+    n_clusters = min(n, 5)
+    if n > KMEANS_SKLEARN_THRESHOLD:
+        kmeans = KMeans(n_clusters=n_clusters, n_init=10)
+        clusters = kmeans.fit_predict(features)
+    else:
+        clusters = _kmeans_lloyd(features, n_clusters, KMEANS_MAX_ITER)
     
     return {
         'clusters': [{'details': comp, 'cluster': int(cluster)} 
@@ -1,26 +1,98 @@
 import os
-import redis
+import asyncio
+import functools
+from contextlib import asynccontextmanager
+import asyncpg
+from redis.asyncio import ConnectionPool as RedisConnectionPool, Redis
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 import minio
 import aiohttp
-from typing import Optional
+from typing import Any, Dict, Optional
+
+DATABASE_URL = os.getenv('DATABASE_URL', 'postgresql://user:password@db:5432/bitebase')
 
 # Database connections
-def get_db_engine():
-    """Get the database engine."""
-    db_url = "postgresql://user:password@db:5432/bitebase"
-    return create_engine(db_url)
+@functools.lru_cache(maxsize=1)
+def _get_db_engine() -> AsyncEngine:
+    return create_async_engine(
+        DATABASE_URL.replace('postgresql://', 'postgresql+asyncpg://', 1),
+        pool_size=20,
+        max_overflow=10,
+        pool_pre_ping=True
+    )
+
+@functools.lru_cache(maxsize=1)
+def _get_session_factory() -> async_sessionmaker:
+    return async_sessionmaker(_get_db_engine(), expire_on_commit=False)
+
+def get_db_session() -> AsyncSession:
+    """Get a database session; use as `async with get_db_session() as session`."""
+    return _get_session_factory()()
+
+# Raw asyncpg pool for hot read paths that do not need the ORM
+_db_pool: Optional[asyncpg.Pool] = None
+
+async def get_db_pool() -> asyncpg.Pool:
+    """Get the process-wide asyncpg pool, creating it on first use."""
+    global _db_pool
+    if _db_pool is None:
+        _db_pool = await asyncpg.create_pool(
+            DATABASE_URL,
+            min_size=10,
+            max_size=50,
+            max_inactive_connection_lifetime=300
+        )
+    return _db_pool
+
+async def close_db_pool():
+    """Close the shared asyncpg pool."""
+    global _db_pool
+    if _db_pool is not None:
+        await _db_pool.close()
+    _db_pool = None
+
+async def _warm_connection(pool: asyncpg.Pool):
+    async with pool.acquire() as conn:
+        await conn.fetchval('SELECT 1')
+
+async def prewarm_connections():
+    """Open and exercise the asyncpg and Redis pools so the first request skips connection setup."""
+    pool = await get_db_pool()
+    # Holding min_size connections at once makes each SELECT 1 land on a distinct connection
+    await asyncio.gather(*(_warm_connection(pool) for _ in range(pool.get_min_size())))
+    await get_redis_client().ping()
 
+def get_db_pool_stats() -> Dict[str, Any]:
+    """Report asyncpg pool occupancy for monitoring."""
+    if _db_pool is None:
+        return {'initialized': False}
+    return {
+        'initialized': True,
+        'size': _db_pool.get_size(),
+        'idle': _db_pool.get_idle_size(),
+        'min_size': _db_pool.get_min_size(),
+        'max_size': _db_pool.get_max_size()
+    }
+
+@functools.lru_cache(maxsize=1)
 def get_vector_db_engine():
-    return create_engine(os.getenv('VECTOR_DB_URL'))
+    return create_engine(os.getenv('VECTOR_DB_URL'), pool_pre_ping=True)
 
 # Redis connection
-def get_redis_client():
-    """Get the Redis client."""
-    redis_url = "redis://redis:6379"
-    return redis.StrictRedis.from_url(redis_url)
+REDIS_URL = os.getenv('REDIS_URL', 'redis://redis:6379')
+REDIS_MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS', '200'))
+
+@functools.lru_cache(maxsize=1)
+def _get_redis_pool() -> RedisConnectionPool:
+    return RedisConnectionPool.from_url(REDIS_URL, max_connections=REDIS_MAX_CONNECTIONS)
+
+def get_redis_client() -> Redis:
+    """Get an async Redis client backed by the shared connection pool."""
+    return Redis(connection_pool=_get_redis_pool())
 
 # MinIO connection
+@functools.lru_cache(maxsize=1)
 def get_minio_client():
     return minio.Minio(
         os.getenv('DATALAKE_URL', 'datalake:9000').replace('http://', ''),
@@ -29,22 +101,55 @@ def get_minio_client():
         secure=False
     )
 
+# Shared HTTP session
+_http_session: Optional[aiohttp.ClientSession] = None
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """Get the process-wide aiohttp session, creating it on first use."""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=180),
+            connector=aiohttp.TCPConnector(
+                limit=1000,
+                limit_per_host=200,
+                ttl_dns_cache=600,
+                keepalive_timeout=60,
+                enable_cleanup_closed=True
+            )
+        )
+    return _http_session
+
+async def close_http_session():
+    """Close the shared aiohttp session."""
+    global _http_session
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
+@asynccontextmanager
+async def lifespan(app):
+    """FastAPI lifespan hook that opens and closes the shared HTTP session."""
+    await get_http_session()
+    yield
+    await close_http_session()
+
 # Airflow connection
-async def get_airflow_client():
-    return await aiohttp.ClientSession().get(
-        f"{os.getenv('AIRFLOW_URL', 'http://airflow:8080')}/api/v1/dags"
-    )
+async def get_airflow_client(session: Optional[aiohttp.ClientSession] = None):
+    if not session:
+        session = await get_http_session()
+    return session, f"{os.getenv('AIRFLOW_URL', 'http://airflow:8080')}/api/v1/dags"
 
 # AI Agent connection
 async def get_ai_agent_client(session: Optional[aiohttp.ClientSession] = None):
     """Get the AI agent client."""
     if not session:
-        session = aiohttp.ClientSession()
+        session = await get_http_session()
     ai_agent_url = "http://ai-agent:8501"
     return session, ai_agent_url
 
 # Prometheus metrics
 async def get_prometheus_client(session: Optional[aiohttp.ClientSession] = None):
     if not session:
-        session = aiohttp.ClientSession()
-    return session, os.getenv('PROMETHEUS_URL', 'http://prometheus:9090')
\ No newline at end of file
+        session = await get_http_session()
+    return session, os.getenv('PROMETHEUS_URL', 'http://prometheus:9090')
@@ -1,20 +1,157 @@
-from typing import Dict, Any, List, Optional
+import asyncio
+import logging
+import operator
+import os
+import pickle
+import re
+import time
+import uuid
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import reduce
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
 import pandas as pd
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import fs as pafs
 from feast import FeatureStore
 from datetime import datetime
 from pydantic import BaseModel
 
+# Pandas callables get views over the pipeline's buffers; copy-on-write defers copies to actual writes
+pd.options.mode.copy_on_write = True
+
+# Validated rows buffered per source before they run through the pipeline as one columnar batch
+PIPELINE_BATCH_SIZE = int(os.getenv('PIPELINE_BATCH_SIZE', '1000'))
+# Oldest a buffered row may get, in seconds, before its batch is flushed
+PIPELINE_FLUSH_INTERVAL = float(os.getenv('PIPELINE_FLUSH_INTERVAL', '5'))
+
+logger = logging.getLogger(__name__)
+
+# Parquet layout for lake writes: zstd trades a little CPU for much less upload bandwidth
+PARQUET_COMPRESSION = 'zstd'
+PARQUET_COMPRESSION_LEVEL = 3
+PARQUET_MAX_ROWS_PER_GROUP = 250_000
+
+Frame = Union[pl.DataFrame, pd.DataFrame, pa.RecordBatch, pa.Table]
+
+# A validation rule: a boolean Polars expression, a regex the value must fully match, or a per-value predicate
+Rule = Union[pl.Expr, re.Pattern, Callable[[Any], bool]]
+
+def _to_polars(data: Frame) -> pl.DataFrame:
+    """Get a Polars frame; Arrow input is wrapped without copying"""
+    if isinstance(data, pl.DataFrame):
+        return data
+    if isinstance(data, pd.DataFrame):
+        return pl.from_pandas(data)
+    return pl.from_arrow(data)
+
+def _from_pandas_lenient(df: pd.DataFrame) -> Tuple[pl.DataFrame, pd.Series]:
+    """Convert a pandas batch to Polars; values whose type does not fit their column are nulled and their rows flagged"""
+    unconvertible = pd.Series(False, index=df.index)
+    try:
+        return pl.from_pandas(df), unconvertible
+    except (pa.ArrowException, pl.exceptions.PolarsError):
+        pass
+
+    # Fall back column by column so only the offending values are dropped
+    columns = {}
+    for name in df.columns:
+        column = df[name]
+        try:
+            columns[name] = pl.from_pandas(column)
+            continue
+        except (pa.ArrowException, pl.exceptions.PolarsError):
+            pass
+        # The column's most common value type wins; values of any other type cannot be converted
+        types = column.map(type, na_action='ignore')
+        bad = types.notna() & (types != types.mode().iloc[0])
+        unconvertible |= bad
+        column = column.where(~bad)
+        try:
+            columns[name] = pl.from_pandas(column)
+        except (pa.ArrowException, pl.exceptions.PolarsError):
+            columns[name] = pl.from_pandas(column.map(str, na_action='ignore'))
+    return pl.DataFrame(columns), unconvertible
+
+def _to_lazy(data: Union[Frame, pl.LazyFrame]) -> pl.LazyFrame:
+    """Start or continue a lazy query over data"""
+    if isinstance(data, pl.LazyFrame):
+        return data
+    return _to_polars(data).lazy()
+
+def _apply_pandas(frame: pl.LazyFrame, func: Callable) -> pl.LazyFrame:
+    """Run a pandas callable; it sees eager data, so the plan built so far is materialized first"""
+    return _to_polars(func(_to_frame(frame.collect()))).lazy()
+
+def _init_feature_worker():
+    """Run once in each feature worker process"""
+    pd.options.mode.copy_on_write = True
+
+def _is_picklable(obj: Any) -> bool:
+    try:
+        pickle.dumps(obj)
+    except Exception:
+        return False
+    return True
+
+def _to_frame(data: Frame) -> pd.DataFrame:
+    """View data as an ArrowDtype-backed DataFrame for pandas callables, sharing the Arrow buffers"""
+    if isinstance(data, pl.DataFrame):
+        return data.to_pandas(use_pyarrow_extension_array=True)
+    if isinstance(data, (pa.RecordBatch, pa.Table)):
+        return data.to_pandas(types_mapper=pd.ArrowDtype)
+    return data
+
+def _to_table(data: Frame) -> pa.Table:
+    """Get an Arrow table for writing, converting from pandas only when needed"""
+    if isinstance(data, pa.Table):
+        return data
+    if isinstance(data, pl.DataFrame):
+        return data.to_arrow()
+    if isinstance(data, pa.RecordBatch):
+        return pa.Table.from_batches([data])
+    return pa.Table.from_pandas(data, preserve_index=False)
+
+def _passes(rule: Callable[[Any], bool], value: Any) -> bool:
+    try:
+        return bool(rule(value))
+    except Exception:
+        return False
+
 class DataValidation:
     def __init__(self):
         self.validation_rules = {}
         self.quarantine_data = []
 
-    def add_validation_rule(self, field: str, rule_func: callable):
-        """Add a validation rule for a field"""
+    def add_validation_rule(self, field: str, rule_func: Rule):
+        """Add a validation rule for a field; expressions and regexes are checked column-at-a-time"""
+        if isinstance(rule_func, str):
+            rule_func = re.compile(rule_func)
         if field not in self.validation_rules:
             self.validation_rules[field] = []
         self.validation_rules[field].append(rule_func)
 
+    @staticmethod
+    def _check_value(rule: Rule, data: Dict[str, Any], field: str) -> bool:
+        if isinstance(rule, pl.Expr):
+            return bool(pl.from_dicts([data]).select(rule).item())
+        if isinstance(rule, re.Pattern):
+            return rule.fullmatch(str(data[field])) is not None
+        return rule(data[field])
+
+    @staticmethod
+    def _check_column(rule: Rule, df: pd.DataFrame, field: str, frame: Optional[pl.LazyFrame]) -> pd.Series:
+        if isinstance(rule, pl.Expr):
+            passed = frame.select(rule.fill_null(False)).collect().to_series()
+            return pd.Series(passed.to_numpy(), index=df.index)
+        column = df[field]
+        if isinstance(rule, re.Pattern):
+            return column.astype(str).str.fullmatch(rule).fillna(False).astype(bool)
+        # Opaque callables fall back to one Python call per value; a value the rule cannot handle fails it
+        return column.map(lambda value: _passes(rule, value), na_action='ignore').fillna(True).astype(bool)
+
     def validate_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate data against defined rules"""
         validation_results = {
@@ -26,7 +163,7 @@ class DataValidation:
         for field, rules in self.validation_rules.items():
             if field in data:
                 for rule in rules:
-                    if not rule(data[field]):
+                    if not self._check_value(rule, data, field):
                         validation_results['is_valid'] = False
                         validation_results['invalid_fields'].append(field)
 
@@ -36,35 +173,105 @@ class DataValidation:
 
         return validation_results
 
+    def validate_batch(self, df: pd.DataFrame) -> pd.Series:
+        """Validate every row of a batch, returning a boolean mask of valid rows"""
+        masks = [pd.Series(True, index=df.index)]
+        # Only expression rules need a Polars frame; rows it cannot represent are invalid
+        frame = None
+        if any(isinstance(rule, pl.Expr) for rules in self.validation_rules.values() for rule in rules):
+            converted, unconvertible = _from_pandas_lenient(df)
+            frame = converted.lazy()
+            masks.append(~unconvertible)
+        for field, rules in self.validation_rules.items():
+            if field not in df.columns:
+                continue
+            # Rows without the field are not checked, as in validate_data
+            missing = df[field].isna()
+            masks.extend(missing | self._check_column(rule, df, field, frame) for rule in rules)
+        valid = reduce(operator.and_, masks)
+
+        if not valid.all():
+            self.quarantine_data.extend(df[~valid].to_dict('records'))
+
+        return valid
+
 class DataCleaning:
     def __init__(self):
         self.cleaning_steps = []
 
-    def add_cleaning_step(self, step_func: callable):
-        """Add a data cleaning step"""
+    def add_cleaning_step(self, step_func: Union[pl.Expr, Callable]):
+        """Add a data cleaning step: a Polars expression, or a function over a pandas DataFrame"""
         self.cleaning_steps.append(step_func)
 
-    def clean_data(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Apply cleaning steps to data"""
-        cleaned_data = data.copy()
+    def clean_data(self, data: Union[Frame, pl.LazyFrame]) -> pl.LazyFrame:
+        """Build the cleaning steps into a lazy query over data"""
+        cleaned_data = _to_lazy(data)
         for step in self.cleaning_steps:
-            cleaned_data = step(cleaned_data)
+            if isinstance(step, pl.Expr):
+                cleaned_data = cleaned_data.with_columns(step)
+            else:
+                cleaned_data = _apply_pandas(cleaned_data, step)
         return cleaned_data
 
 class FeatureEngineering:
     def __init__(self):
         self.feature_transformations = {}
         self.feature_store = FeatureStore(repo_path="feature_repo")
+        # Pandas transforms that can be shipped to worker processes (module-level functions, not lambdas)
+        self._picklable = set()
+        self._pool: Optional[ProcessPoolExecutor] = None
 
-    def add_transformation(self, feature_name: str, transform_func: callable):
-        """Add a feature transformation"""
+    def add_transformation(self, feature_name: str, transform_func: Union[pl.Expr, Callable]):
+        """Add a feature transformation: a Polars expression, or a function over a pandas DataFrame"""
         self.feature_transformations[feature_name] = transform_func
-
-    def create_features(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Create features from data"""
-        features = data.copy()
-        for feature_name, transform in self.feature_transformations.items():
-            features[feature_name] = transform(features)
+        self._picklable.discard(feature_name)
+        if not isinstance(transform_func, pl.Expr) and _is_picklable(transform_func):
+            self._picklable.add(feature_name)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Get the worker pool for pandas transforms, started once and reused across batches"""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_feature_worker)
+        return self._pool
+
+    def create_features(self, data: Union[Frame, pl.LazyFrame]) -> pl.LazyFrame:
+        """Build the feature transformations into a lazy query over data"""
+        features = _to_lazy(data)
+
+        # Expression features are evaluated together against the incoming columns in one parallel pass
+        exprs = [
+            transform.alias(feature_name)
+            for feature_name, transform in self.feature_transformations.items()
+            if isinstance(transform, pl.Expr)
+        ]
+        if exprs:
+            features = features.with_columns(exprs)
+
+        callables = {
+            feature_name: transform
+            for feature_name, transform in self.feature_transformations.items()
+            if not isinstance(transform, pl.Expr)
+        }
+        if callables:
+            # Independent CPU-bound transforms run on separate cores when they can be pickled
+            parallel = len(callables) > 1 and self._picklable.issuperset(callables)
+
+            def add_features(frame: pd.DataFrame) -> pd.DataFrame:
+                # Compute every column first and attach them in one assign, not one __setitem__ each
+                if parallel:
+                    pool = self._get_pool()
+                    futures = {
+                        feature_name: pool.submit(transform, frame)
+                        for feature_name, transform in callables.items()
+                    }
+                    new_cols = {feature_name: future.result() for feature_name, future in futures.items()}
+                else:
+                    new_cols = {
+                        feature_name: transform(frame)
+                        for feature_name, transform in callables.items()
+                    }
+                return frame.assign(**new_cols)
+            features = _apply_pandas(features, add_features)
         return features
 
     def save_to_feature_store(self, features: pd.DataFrame, feature_view: str):
@@ -76,6 +283,16 @@ class DataLake:
         self.raw_zone = "s3://data-lake/raw/"
         self.processed_zone = "s3://data-lake/processed/"
         self.feature_zone = "s3://data-lake/features/"
+        # Background writes upload multipart chunks while the next ones are still being encoded
+        self.filesystem = pafs.S3FileSystem(
+            endpoint_override=os.getenv('DATALAKE_URL', 'datalake:9000').replace('http://', ''),
+            access_key=os.getenv('MINIO_ACCESS_KEY', 'minioadmin'),
+            secret_key=os.getenv('MINIO_SECRET_KEY', 'minioadmin'),
+            scheme='http',
+            background_writes=True
+        )
+        # Blocking Parquet writes run here so uploads to different zones proceed in parallel
+        self._s3_pool = ThreadPoolExecutor(max_workers=32)
 
     async def save_raw_data(self, data: Any, source: str):
         """Save data to raw zone"""
@@ -83,17 +300,28 @@ class DataLake:
         # Implement save logic
         pass
 
-    async def save_processed_data(self, data: pd.DataFrame, name: str):
+    async def save_processed_data(self, data: Frame, name: str):
         """Save data to processed zone"""
         path = f"{self.processed_zone}{name}/{datetime.now().strftime('%Y/%m/%d')}"
-        # Save as Parquet/Delta Lake format
-        pass
+        await asyncio.get_running_loop().run_in_executor(self._s3_pool, self._write_parquet, data, path)
 
-    async def save_features(self, features: pd.DataFrame, feature_set: str):
+    async def save_features(self, features: Frame, feature_set: str):
         """Save features to feature zone"""
         path = f"{self.feature_zone}{feature_set}/{datetime.now().strftime('%Y/%m/%d')}"
-        # Save features
-        pass
+        await asyncio.get_running_loop().run_in_executor(self._s3_pool, self._write_parquet, features, path)
+
+    def _write_parquet(self, data: Frame, path: str):
+        """Write one batch as Parquet files under path"""
+        pq.write_to_dataset(
+            _to_table(data),
+            path.removeprefix('s3://'),
+            filesystem=self.filesystem,
+            basename_template=f"{uuid.uuid4().hex}-{{i}}.parquet",
+            use_threads=True,
+            max_rows_per_group=PARQUET_MAX_ROWS_PER_GROUP,
+            compression=PARQUET_COMPRESSION,
+            compression_level=PARQUET_COMPRESSION_LEVEL
+        )
 
 class DataWarehouse:
     def __init__(self):
@@ -129,12 +357,21 @@ class DataWarehouse:
         pass
 
 class DataPipeline:
-    def __init__(self):
+    def __init__(self, batch_size: int = PIPELINE_BATCH_SIZE, flush_interval: float = PIPELINE_FLUSH_INTERVAL):
         self.validation = DataValidation()
         self.cleaning = DataCleaning()
         self.feature_engineering = FeatureEngineering()
         self.data_lake = DataLake()
         self.data_warehouse = DataWarehouse()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # Validated rows awaiting a columnar flush, keyed by source
+        self._batch_builder: Dict[str, List[Dict[str, Any]]] = {}
+        self._batch_started: Dict[str, float] = {}
+        # Per-source timers flush a batch whose source goes quiet before it fills up
+        self._flush_timers: Dict[str, asyncio.TimerHandle] = {}
+        self._timed_flushes: set = set()
+        _open_pipelines.add(self)
 
     async def process_data(self, data: Dict[str, Any], source: str) -> Dict[str, Any]:
         """Process data through the pipeline"""
@@ -146,43 +383,146 @@ class DataPipeline:
         if not validation_result['is_valid']:
             return validation_result
 
-        # Clean and transform data
-        df = pd.DataFrame([data])
-        cleaned_data = self.cleaning.clean_data(df)
-        
-        # Save processed data
-        await self.data_lake.save_processed_data(cleaned_data, f"{source}_processed")
+        # Buffer the row; the batch runs once it is full or its oldest row is due
+        rows = self._batch_builder.setdefault(source, [])
+        if not rows:
+            self._batch_started[source] = time.monotonic()
+            self._flush_timers[source] = asyncio.get_running_loop().call_later(
+                self.flush_interval, self._flush_due, source
+            )
+        rows.append(data)
+        if len(rows) < self.batch_size and time.monotonic() - self._batch_started[source] < self.flush_interval:
+            return {
+                'status': 'success',
+                'validation': validation_result,
+                'buffered': len(rows)
+            }
 
-        # Create features
-        features = self.feature_engineering.create_features(cleaned_data)
-        
-        # Save features
-        await self.data_lake.save_features(features, f"{source}_features")
-        self.feature_engineering.save_to_feature_store(features, f"{source}_feature_view")
+        result = await self.flush(source)
+        result['validation'] = validation_result
+        return result
+
+    async def flush(self, source: str) -> Dict[str, Any]:
+        """Run the rows buffered for a source through the pipeline as one Arrow batch"""
+        rows = self._batch_builder.pop(source, [])
+        self._batch_started.pop(source, None)
+        if (timer := self._flush_timers.pop(source, None)) is not None:
+            timer.cancel()
+        if not rows:
+            return {'status': 'success', 'rows': 0, 'features_created': []}
+
+        # One typed Arrow array per field; rows missing a field contribute nulls
+        fields = dict.fromkeys(key for row in rows for key in row)
+        batch = pa.RecordBatch.from_pydict({
+            field: [row.get(field) for row in rows]
+            for field in fields
+        })
+        return await self._process_batch(batch, source)
+
+    def _flush_due(self, source: str):
+        """Timer callback: flush a source's batch once its oldest row reaches flush_interval"""
+        self._flush_timers.pop(source, None)
+        task = asyncio.ensure_future(self.flush(source))
+        self._timed_flushes.add(task)
+        task.add_done_callback(self._timed_flush_done)
+
+    def _timed_flush_done(self, task: asyncio.Task):
+        self._timed_flushes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Timed pipeline flush failed", exc_info=task.exception())
+
+    async def close(self):
+        """Flush every buffered source and wait for in-flight timed flushes"""
+        for timer in self._flush_timers.values():
+            timer.cancel()
+        self._flush_timers.clear()
+        # Timed flushes log their own failures
+        await asyncio.gather(*self._timed_flushes, return_exceptions=True)
+        results = await asyncio.gather(
+            *(self.flush(source) for source in list(self._batch_builder)),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.error("Pipeline flush on close failed", exc_info=result)
+        _open_pipelines.discard(self)
+
+    async def process_batch_df(self, df: pd.DataFrame, source: str) -> Dict[str, Any]:
+        """Process a whole batch of records through the pipeline at once"""
+        # Validate all rows in one pass and keep the valid ones
+        valid = self.validation.validate_batch(df)
+        batch = None
+        if valid.any():
+            rows = df[valid]
+            batch, unconvertible = _from_pandas_lenient(rows)
+            # Rows with values that do not fit their column's type are quarantined, not fatal to the batch
+            if unconvertible.any():
+                self.validation.quarantine_data.extend(rows[unconvertible].to_dict('records'))
+                batch = batch.filter(~unconvertible.to_numpy())
+        valid_count = 0 if batch is None else len(batch)
+        result = {
+            'status': 'success',
+            'valid': valid_count,
+            'invalid': len(df) - valid_count,
+            'features_created': []
+        }
 
-        # Load to warehouse
-        await self.data_warehouse.load_data(source, features)
+        # The raw batch lands in the lake alongside processing of its valid rows
+        if valid_count:
+            _, processed = await asyncio.gather(
+                self.data_lake.save_raw_data(df, source),
+                self._process_batch(batch, source)
+            )
+            result.update(processed)
+        else:
+            await self.data_lake.save_raw_data(df, source)
+        return result
+
+    async def _process_batch(self, batch: Frame, source: str) -> Dict[str, Any]:
+        """Clean, featurize and store a batch of validated rows"""
+        # Clean and create features as one fused query; the shared cleaning subplan runs once
+        cleaned_query = self.cleaning.clean_data(batch)
+        features_query = self.feature_engineering.create_features(cleaned_query)
+        cleaned_data, features = pl.collect_all([cleaned_query, features_query])
+        # The feature store and warehouse take pandas; the Arrow-backed view shares the column buffers
+        features_df = _to_frame(features)
+        
+        # Storage targets are independent, so write processed data, features and the warehouse concurrently
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            self.data_lake.save_processed_data(cleaned_data, f"{source}_processed"),
+            self.data_lake.save_features(features, f"{source}_features"),
+            loop.run_in_executor(
+                None, self.feature_engineering.save_to_feature_store, features_df, f"{source}_feature_view"
+            ),
+            self.data_warehouse.load_data(source, features_df)
+        )
 
         return {
             'status': 'success',
-            'validation': validation_result,
-            'features_created': features.columns.tolist()
+            'rows': len(features),
+            'features_created': features.columns
         }
 
+# Pipelines with rows possibly still buffered, flushed by close_pipelines at shutdown
+_open_pipelines: "weakref.WeakSet[DataPipeline]" = weakref.WeakSet()
+
+async def close_pipelines():
+    """Flush and close every open DataPipeline; call on service shutdown."""
+    await asyncio.gather(*(pipeline.close() for pipeline in list(_open_pipelines)))
+
 class BatchProcessor:
     def __init__(self, pipeline: DataPipeline):
         self.pipeline = pipeline
 
     async def process_batch(self, batch_data: List[Dict[str, Any]], source: str) -> Dict[str, Any]:
         """Process a batch of data"""
-        results = []
-        for data in batch_data:
-            result = await self.pipeline.process_data(data, source)
-            results.append(result)
+        df = pd.DataFrame(batch_data)
+        result = await self.pipeline.process_batch_df(df, source)
         return {
-            'processed': len(results),
-            'successful': sum(1 for r in results if r.get('status') == 'success'),
-            'failed': sum(1 for r in results if r.get('status') != 'success')
+            'processed': len(df),
+            'successful': result['valid'],
+            'failed': result['invalid']
         }
 
 class StreamProcessor:
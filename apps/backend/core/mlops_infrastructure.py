@@ -1,53 +1,160 @@
+import asyncio
+import hashlib
+import importlib
 import os
-from typing import Dict, Any, Optional
-import redis
+import time
+from collections import defaultdict
+from typing import Dict, Any, List, Optional
+import orjson
+from cachetools import TTLCache
+from packaging.version import InvalidVersion, Version
+from sortedcontainers import SortedList
+from redis.asyncio import ConnectionPool, Redis
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 import mlflow
+from mlflow.entities import Metric, Param
+from mlflow.tracking import MlflowClient
 import optuna
 from ray import tune
 
+# Concurrent /predict calls are coalesced into batches of up to PREDICT_BATCH_MAX, waiting at most PREDICT_BATCH_WAIT
+PREDICT_BATCH_MAX = int(os.getenv('PREDICT_BATCH_MAX', '64'))
+PREDICT_BATCH_WAIT = float(os.getenv('PREDICT_BATCH_WAIT_MS', '10')) / 1000
+
+class PredictRequest(BaseModel):
+    """Model input for /predict."""
+    features: Dict[str, float]
+
 class ModelServing:
     def __init__(self):
-        self.app = FastAPI()
-        self.cache = redis.Redis(host='localhost', port=6379, db=0)
+        self.app = FastAPI(default_response_class=ORJSONResponse)
+        self.pool = ConnectionPool(host='localhost', port=6379, db=0, max_connections=64)
+        self.cache = Redis(connection_pool=self.pool)
         self.cache_ttl = 3600  # 1 hour cache TTL
+        # Process-local L1 in front of Redis; safe without locks on a single event loop
+        self.l1 = TTLCache(maxsize=10_000, ttl=self.cache_ttl)
+        self._predict_queue: Optional[asyncio.Queue] = None
+        self._predict_worker: Optional[asyncio.Task] = None
         
         @self.app.post("/predict")
-        async def predict(data: Dict[str, Any]):
+        async def predict(request: PredictRequest):
             """Real-time prediction endpoint"""
+            data = request.features
             try:
-                # Check cache
-                cache_key = str(hash(str(data)))
-                cached_result = self.cache.get(cache_key)
+                # Check cache; sorted-key JSON gives a key that is stable across workers and restarts
+                payload = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+                cache_key = "pred:" + hashlib.blake2b(payload, digest_size=16).hexdigest()
+                if cache_key in self.l1:
+                    return {'prediction': self.l1[cache_key], 'cached': 'l1'}
+                cached_result = await self.cache.get(cache_key)
                 if cached_result:
-                    return {'prediction': cached_result, 'cached': True}
+                    prediction = orjson.loads(cached_result)
+                    self.l1[cache_key] = prediction
+                    return {'prediction': prediction, 'cached': True}
                 
-                # Get prediction
-                result = await self.get_prediction(data)
+                # Get prediction; cache hits above never reach the batcher
+                result = await self.submit_prediction(data)
                 
                 # Cache result
-                self.cache.setex(cache_key, self.cache_ttl, str(result))
+                await self.cache.setex(cache_key, self.cache_ttl, orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY))
+                self.l1[cache_key] = result
                 
                 return {'prediction': result, 'cached': False}
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
 
+    async def _batch_worker(self, queue: asyncio.Queue):
+        """Drain queued prediction requests into batched model calls"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + PREDICT_BATCH_WAIT
+            while len(batch) < PREDICT_BATCH_MAX:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                results = await self.get_predictions([data for data, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def submit_prediction(self, data: Dict[str, Any]) -> Any:
+        """Queue a prediction request for the batch worker and wait for its result"""
+        if self._predict_worker is None or self._predict_worker.done():
+            self._predict_queue = asyncio.Queue()
+            self._predict_worker = asyncio.create_task(self._batch_worker(self._predict_queue))
+
+        future = asyncio.get_running_loop().create_future()
+        await self._predict_queue.put((data, future))
+        return await future
+
+    async def get_predictions(self, batch: List[Dict[str, Any]]) -> List[Any]:
+        """Get model predictions for a batch; override with a single vectorized model.predict(X) call"""
+        return await asyncio.gather(*(self.get_prediction(data) for data in batch))
+
     async def get_prediction(self, data: Dict[str, Any]) -> Any:
         """Get model prediction"""
         # Implement model prediction logic
         pass
 
+# One tracking URI and client per process, so the client's HTTP session and keep-alive connections are reused
+_TRACKING_URI = os.getenv("MLFLOW_TRACKING_URI", "http://localhost:5000")
+mlflow.set_tracking_uri(_TRACKING_URI)
+_CLIENT = MlflowClient(tracking_uri=_TRACKING_URI)
+
+def _active_run_id() -> str:
+    """ID of the active run, starting one if none is active as mlflow.log_metric/log_param do"""
+    run = mlflow.active_run() or mlflow.start_run()
+    return run.info.run_id
+
+# Per-step metrics are sent every METRIC_FLUSH_STEPS steps or METRIC_FLUSH_INTERVAL seconds
+METRIC_FLUSH_STEPS = int(os.getenv('METRIC_FLUSH_STEPS', '50'))
+METRIC_FLUSH_INTERVAL = float(os.getenv('METRIC_FLUSH_INTERVAL', '10'))
+
+# MLflow flavor for each model library; models from anything else are logged through a pyfunc wrapper
+_MODEL_FLAVORS = {
+    'sklearn': 'sklearn',
+    'xgboost': 'xgboost',
+    'lightgbm': 'lightgbm',
+    'torch': 'pytorch',
+    'prophet': 'prophet',
+    'statsmodels': 'statsmodels'
+}
+
+class _PredictWrapper(mlflow.pyfunc.PythonModel):
+    """Expose any object with a predict method as an MLflow pyfunc model."""
+    def __init__(self, model: Any):
+        self.model = model
+
+    def predict(self, context, model_input):
+        return self.model.predict(model_input)
+
 class MLflowExperimentTracking:
     def __init__(self):
-        self.mlflow_uri = os.getenv("MLFLOW_TRACKING_URI", "http://localhost:5000")
-        mlflow.set_tracking_uri(self.mlflow_uri)
+        self.mlflow_uri = _TRACKING_URI
+        self._pending_metrics: List[Metric] = []
+        self._pending_steps = 0
+        self._last_flush = time.monotonic()
 
     def start_experiment(self, experiment_name: str) -> str:
         """Start a new MLflow experiment"""
-        experiment = mlflow.get_experiment_by_name(experiment_name)
+        experiment = _CLIENT.get_experiment_by_name(experiment_name)
         if experiment is None:
-            experiment_id = mlflow.create_experiment(experiment_name)
+            experiment_id = _CLIENT.create_experiment(experiment_name)
         else:
             experiment_id = experiment.experiment_id
         
@@ -55,17 +162,43 @@ class MLflowExperimentTracking:
 
     def log_metrics(self, metrics: Dict[str, float]):
         """Log metrics to MLflow"""
-        for metric_name, value in metrics.items():
-            mlflow.log_metric(metric_name, value)
+        timestamp = int(time.time() * 1000)
+        _CLIENT.log_batch(
+            _active_run_id(),
+            metrics=[Metric(name, value, timestamp, 0) for name, value in metrics.items()]
+        )
 
     def log_params(self, params: Dict[str, Any]):
         """Log parameters to MLflow"""
-        for param_name, value in params.items():
-            mlflow.log_param(param_name, value)
+        _CLIENT.log_batch(
+            _active_run_id(),
+            params=[Param(name, str(value)) for name, value in params.items()]
+        )
+
+    def log_step_metrics(self, metrics: Dict[str, float], step: int):
+        """Buffer per-step training metrics and send them in bulk"""
+        timestamp = int(time.time() * 1000)
+        self._pending_steps += 1
+        self._pending_metrics.extend(Metric(name, value, timestamp, step) for name, value in metrics.items())
+        if (self._pending_steps >= METRIC_FLUSH_STEPS
+                or time.monotonic() - self._last_flush >= METRIC_FLUSH_INTERVAL):
+            self.flush_metrics()
+
+    def flush_metrics(self):
+        """Send any buffered per-step metrics to MLflow"""
+        pending, self._pending_metrics = self._pending_metrics, []
+        self._pending_steps = 0
+        self._last_flush = time.monotonic()
+        if pending:
+            _CLIENT.log_batch(_active_run_id(), metrics=pending)
 
     def log_model(self, model: Any, model_name: str):
         """Log model to MLflow"""
-        mlflow.sklearn.log_model(model, model_name)
+        flavor = _MODEL_FLAVORS.get(type(model).__module__.split('.')[0])
+        if flavor is None:
+            mlflow.pyfunc.log_model(model_name, python_model=_PredictWrapper(model))
+        else:
+            importlib.import_module(f"mlflow.{flavor}").log_model(model, model_name)
 
 class HyperparameterTuning:
     def __init__(self):
@@ -112,24 +245,31 @@ class DistributedTraining:
 
 class ModelRegistry:
     def __init__(self):
-        self.models = {}
-        self.model_versions = {}
+        self.models = defaultdict(dict)
+        # Versions kept in semantic order, so the latest is always [-1] whatever the registration order
+        self.model_versions = defaultdict(lambda: SortedList(key=Version))
 
     def register_model(self, model_name: str, model_path: str, version: str) -> Dict[str, Any]:
         """Register a model in the registry"""
-        if model_name not in self.models:
-            self.models[model_name] = {}
-            self.model_versions[model_name] = []
-        
+        try:
+            Version(version)
+        except InvalidVersion:
+            raise ValueError(f"Version {version} of model {model_name} is not a PEP 440 version") from None
+        active_run = mlflow.active_run()
+        if active_run is None:
+            raise ValueError(f"No active MLflow run to register model {model_name} from")
+        # One fetch per registration, uncached: metrics may be logged from anywhere up to this point
+        run = _CLIENT.get_run(active_run.info.run_id)
         model_info = {
             'path': model_path,
             'version': version,
-            'timestamp': mlflow.get_run(run_id=mlflow.active_run().info.run_id).info.start_time,
-            'metrics': mlflow.get_run(run_id=mlflow.active_run().info.run_id).data.metrics
+            'timestamp': run.info.start_time,
+            'metrics': dict(run.data.metrics)
         }
         
+        if version not in self.models[model_name]:
+            self.model_versions[model_name].add(version)
         self.models[model_name][version] = model_info
-        self.model_versions[model_name].append(version)
         
         return model_info
 
@@ -150,7 +290,7 @@ class ModelRegistry:
     def list_models(self) -> Dict[str, List[str]]:
         """List all models and their versions in the registry"""
         return {
-            model_name: versions 
+            model_name: list(versions)
             for model_name, versions in self.model_versions.items()
         }
 
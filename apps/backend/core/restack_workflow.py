@@ -28,8 +28,11 @@ async def on_competitor_analysis(event_data: Dict[str, Any]) -> Dict[str, Any]:
 
 async def on_data_collection(event_data: Dict[str, Any]) -> Dict[str, Any]:
     """Handle data collection event"""
-    pos_data = await collect_pos_data(event_data)
-    inventory_data = await collect_inventory_data(event_data)
+    # POS and inventory collection are independent, so run them concurrently
+    pos_data, inventory_data = await asyncio.gather(
+        collect_pos_data(event_data),
+        collect_inventory_data(event_data)
+    )
     return {
         "pos_data": pos_data,
         "inventory_data": inventory_data
@@ -37,8 +40,10 @@ async def on_data_collection(event_data: Dict[str, Any]) -> Dict[str, Any]:
 
 async def on_bi_analysis(event_data: Dict[str, Any]) -> Dict[str, Any]:
     """Handle business intelligence analysis event"""
-    insights = await generate_executive_insights(event_data)
-    metrics = await generate_operational_metrics(event_data)
+    insights, metrics = await asyncio.gather(
+        generate_executive_insights(event_data),
+        generate_operational_metrics(event_data)
+    )
     return {
         "insights": insights,
         "metrics": metrics
@@ -47,28 +52,28 @@ async def on_bi_analysis(event_data: Dict[str, Any]) -> Dict[str, Any]:
 # Register workflow events with Restack
 async def register_workflows():
     """Register workflows with Restack"""
-    await client.register_event_handler(
-        "market_analysis",
-        on_market_analysis,
-        description="Analyze market trends and patterns"
-    )
-
-    await client.register_event_handler(
-        "competitor_analysis",
-        on_competitor_analysis,
-        description="Analyze competitor data and strategies"
-    )
-
-    await client.register_event_handler(
-        "data_collection",
-        on_data_collection,
-        description="Collect POS and inventory data"
-    )
-
-    await client.register_event_handler(
-        "bi_analysis",
-        on_bi_analysis,
-        description="Generate business intelligence insights"
+    # Registrations are independent round-trips to the Restack server, so send them together
+    await asyncio.gather(
+        client.register_event_handler(
+            "market_analysis",
+            on_market_analysis,
+            description="Analyze market trends and patterns"
+        ),
+        client.register_event_handler(
+            "competitor_analysis",
+            on_competitor_analysis,
+            description="Analyze competitor data and strategies"
+        ),
+        client.register_event_handler(
+            "data_collection",
+            on_data_collection,
+            description="Collect POS and inventory data"
+        ),
+        client.register_event_handler(
+            "bi_analysis",
+            on_bi_analysis,
+            description="Generate business intelligence insights"
+        )
     )
 
 if __name__ == "__main__":
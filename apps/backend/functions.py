@@ -4,60 +4,119 @@ Backend Functions Module
 This module provides core functionality for the backend services.
 """
 
-import aiohttp
+import asyncio
+import hashlib
+import io
+import logging
+import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
-import json
+import msgspec
+import orjson
+from cachetools import TTLCache
 from restack_ai.function import function, FunctionFailure, log
+from restack_ai.observability import logger as restack_logger
 from apps.backend.core.connections import (
-    get_db_engine,
+    get_db_pool,
     get_redis_client,
     get_ai_agent_client,
 )
 
 # Initialize service connections
-db_engine = get_db_engine()
 redis_client = get_redis_client()
 
-@dataclass
+# Cap concurrent requests to the AI agent at its upstream rate limit
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '16'))
+_llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
+# Opt-in micro-batching of llm_chat calls; needs the AI agent's /chat/batch endpoint
+LLM_BATCHING = os.getenv('LLM_BATCHING') == '1'
+LLM_BATCH_MAX = int(os.getenv('LLM_BATCH_MAX', '32'))
+LLM_BATCH_WAIT = float(os.getenv('LLM_BATCH_WAIT_MS', '10')) / 1000
+_chat_queue: Optional[asyncio.Queue] = None
+_chat_worker: Optional[asyncio.Task] = None
+
+# Identical conversations reuse the AI agent's response for an hour
+LLM_CACHE_TTL = 3600
+
+@dataclass(slots=True)
 class Message:
     """Message class for chat conversations."""
     role: str
     content: str
 
-@dataclass
+@dataclass(slots=True)
 class ChatChoice:
     """Represents a single chat completion choice."""
     message: Message
     finish_reason: Optional[str] = None
     index: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class LlmChatResponse:
     """Response model for LLM chat function."""
     choices: List[ChatChoice]
     model: Optional[str] = None
     created: Optional[int] = None
 
-@dataclass
+@dataclass(slots=True)
 class SalesData:
     """Container for sales data results."""
     data: Dict[str, Any]
     source: str  # 'cache' or 'database'
     timestamp: str
 
-def _sanitize_input(query: str) -> str:
+# Cache TTLs per data class: the unfiltered set changes slowly, filtered lookups stay fresher
+TTL_POLICY = {
+    "sales_all": 6 * 3600,
+    "sales_filtered": 600,
+}
+
+# In-process L1 in front of Redis for bursts of repeated lookups; results larger
+# than SALES_L1_MAX_BYTES encoded are left to Redis so the L1 stays small
+SALES_L1_MAX_BYTES = 1024 * 1024
+_sales_l1: TTLCache = TTLCache(maxsize=256, ttl=30)
+
+# Rows fetched per round-trip when streaming sales through a server-side cursor
+SALES_CURSOR_PREFETCH = 500
+
+async def _fetch_sales_json(query: Optional[str] = None) -> bytes:
     """
-    Sanitize the input query to prevent SQL injection.
+    Stream matching sales rows into a JSON array.
+    
+    Rows are read through a server-side cursor and serialized one at a time, so the
+    result set is never held as a list of Records plus a list of dicts.
     
     Args:
-        query: Raw query string
+        query: Optional search query to filter sales data
         
     Returns:
-        str: Sanitized query string
+        bytes: JSON-encoded list of sales rows
     """
-    return query.replace("'", "''")
+    buffer = io.BytesIO()
+    buffer.write(b"[")
+    pool = await get_db_pool()
+    async with pool.acquire() as conn:
+        # asyncpg cursors only live inside a transaction
+        async with conn.transaction():
+            # The filter is bound as a parameter, never interpolated
+            if query:
+                cursor = conn.cursor(
+                    "SELECT * FROM sales WHERE data LIKE $1", f"%{query}%",
+                    prefetch=SALES_CURSOR_PREFETCH
+                )
+            else:
+                cursor = conn.cursor("SELECT * FROM sales", prefetch=SALES_CURSOR_PREFETCH)
+
+            first = True
+            async for record in cursor:
+                if not first:
+                    buffer.write(b",")
+                buffer.write(orjson.dumps(record, default=dict))
+                first = False
+    buffer.write(b"]")
+    return buffer.getvalue()
 
 @function.defn()
 async def lookupSales(query: Optional[str] = None) -> SalesData:
@@ -75,59 +134,164 @@ async def lookupSales(query: Optional[str] = None) -> SalesData:
     """
     cache_key = f"sales_lookup_{query}" if query else "sales_lookup_all"
     
+    if (sales := _sales_l1.get(cache_key)) is not None:
+        return sales
+    
     try:
-        # Try cache first
-        if cached_data := redis_client.get(cache_key):
-            log.info("Cache hit for sales data", query=query)
-            return SalesData(
-                data=json.loads(cached_data.decode('utf-8')),
+        # Try cache first; the payload carries its own timestamp
+        if cached := await redis_client.get(cache_key):
+            # Restack's log wrapper builds its extra fields before the level check, so hot-path
+            # info logs check the level of the restack logger behind it first
+            if restack_logger.isEnabledFor(logging.INFO):
+                log.info("Cache hit for sales data", query=query)
+            entry = orjson.loads(cached)
+            sales = SalesData(
+                data=entry["data"],
                 source="cache",
-                timestamp=redis_client.get(f"{cache_key}_timestamp").decode('utf-8')
+                timestamp=entry["ts"]
             )
+            if len(cached) <= SALES_L1_MAX_BYTES:
+                _sales_l1[cache_key] = sales
+            return sales
     except Exception as e:
         log.warning("Cache retrieval failed", error=str(e))
     
     try:
-        # Construct query
-        base_query = "SELECT * FROM sales"
-        if query:
-            sanitized_query = _sanitize_input(query)
-            where_clause = f" WHERE data LIKE '%{sanitized_query}%'"
-            full_query = base_query + where_clause
-        else:
-            full_query = base_query
-
-        # Execute query
-        with db_engine.connect() as conn:
-            result = conn.execute(full_query).fetchall()
-            data = [dict(row) for row in result]
-            
-            # Cache the results
-            try:
-                timestamp = datetime.now().isoformat()
-                redis_client.setex(
-                    cache_key,
-                    3600,  # 1 hour expiration
-                    json.dumps(data)
-                )
-                redis_client.setex(
-                    f"{cache_key}_timestamp",
-                    3600,
-                    timestamp
-                )
-            except Exception as e:
-                log.warning("Failed to cache results", error=str(e))
-            
-            return SalesData(
-                data=data,
-                source="database",
-                timestamp=datetime.now().isoformat()
-            )
+        # Execute query, serializing once for both the cache and the response
+        payload = await _fetch_sales_json(query)
+        data = orjson.loads(payload)
+        
+        timestamp = datetime.now().isoformat()
+        
+        # Cache the results, wrapping the already-encoded rows rather than re-encoding them
+        try:
+            ttl = TTL_POLICY["sales_filtered" if query else "sales_all"]
+            entry = b'{"data":' + payload + b',"ts":' + orjson.dumps(timestamp) + b'}'
+            await redis_client.setex(cache_key, ttl, entry)
+        except Exception as e:
+            log.warning("Failed to cache results", error=str(e))
+        
+        sales = SalesData(
+            data=data,
+            source="database",
+            timestamp=timestamp
+        )
+        if len(payload) <= SALES_L1_MAX_BYTES:
+            _sales_l1[cache_key] = sales
+        return sales
             
     except Exception as e:
         log.error("Database lookup failed", error=str(e))
         raise FunctionFailure(f"Failed to retrieve sales data: {str(e)}") from e
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+@dataclass(slots=True)
+class _ChatBatchResponse:
+    """Envelope returned by the AI agent's batch endpoint."""
+    responses: List[LlmChatResponse]
+
+# Typed decoders build the response dataclasses straight from the JSON bytes
+_chat_decoder = msgspec.json.Decoder(LlmChatResponse)
+_chat_batch_decoder = msgspec.json.Decoder(_ChatBatchResponse)
+
+def _decode_chat(raw: bytes, decoder: msgspec.json.Decoder) -> Any:
+    """Decode an AI agent response, surfacing malformed bodies as FunctionFailure."""
+    try:
+        return decoder.decode(raw)
+    except msgspec.DecodeError as e:
+        raise FunctionFailure(f"Invalid response format from AI agent: {e}") from e
+
+async def _post_chat(payload: bytes) -> LlmChatResponse:
+    """
+    Send a single chat request to the AI agent.
+    
+    Args:
+        payload: JSON-encoded chat request body
+        
+    Returns:
+        LlmChatResponse: Decoded AI agent response
+        
+    Raises:
+        FunctionFailure: If the AI agent returns an error status or a malformed body
+    """
+    session, ai_url = await get_ai_agent_client()
+    async with _llm_semaphore, session.post(f"{ai_url}/chat", data=payload, headers=_JSON_HEADERS) as response:
+        if response.status != 200:
+            error_text = await response.text()
+            raise FunctionFailure(
+                f"AI agent error {response.status}: {error_text}"
+            )
+        return _decode_chat(await response.read(), _chat_decoder)
+
+async def _post_chat_batch(payloads: List[bytes]) -> List[LlmChatResponse]:
+    """
+    Send several chat requests to the AI agent in one round-trip.
+    
+    Requires the AI agent to expose ``POST /chat/batch`` accepting
+    ``{"requests": [...]}`` and answering ``{"responses": [...]}`` in the same order.
+    
+    Args:
+        payloads: JSON-encoded chat request bodies
+        
+    Returns:
+        List[LlmChatResponse]: One decoded response per request
+        
+    Raises:
+        FunctionFailure: If the AI agent returns an error status or a mismatched batch
+    """
+    body = b'{"requests":[' + b','.join(payloads) + b']}'
+    session, ai_url = await get_ai_agent_client()
+    async with _llm_semaphore, session.post(f"{ai_url}/chat/batch", data=body, headers=_JSON_HEADERS) as response:
+        if response.status != 200:
+            error_text = await response.text()
+            raise FunctionFailure(
+                f"AI agent error {response.status}: {error_text}"
+            )
+        result = _decode_chat(await response.read(), _chat_batch_decoder)
+
+    if len(result.responses) != len(payloads):
+        raise FunctionFailure("Invalid batch response format from AI agent")
+    return result.responses
+
+async def _chat_batch_worker(queue: asyncio.Queue) -> None:
+    """Drain queued chat requests into batches of up to LLM_BATCH_MAX, waiting at most LLM_BATCH_WAIT."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + LLM_BATCH_WAIT
+        while len(batch) < LLM_BATCH_MAX:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        try:
+            responses = await _post_chat_batch([payload for payload, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            continue
+
+        for (_, future), response in zip(batch, responses):
+            if not future.done():
+                future.set_result(response)
+
+async def _submit_chat(payload: bytes) -> LlmChatResponse:
+    """Queue a chat request for the batch worker and wait for its response."""
+    global _chat_queue, _chat_worker
+    if _chat_worker is None or _chat_worker.done():
+        _chat_queue = asyncio.Queue()
+        _chat_worker = asyncio.create_task(_chat_batch_worker(_chat_queue))
+
+    future = asyncio.get_running_loop().create_future()
+    await _chat_queue.put((payload, future))
+    return await future
+
 @function.defn()
 async def llm_chat(messages: List[Message], system_content: str) -> LlmChatResponse:
     """
@@ -143,50 +307,40 @@ async def llm_chat(messages: List[Message], system_content: str) -> LlmChatRespo
     Raises:
         FunctionFailure: If chat processing fails
     """
-    log.info("Processing chat", num_messages=len(messages))
+    if restack_logger.isEnabledFor(logging.INFO):
+        log.info("Processing chat", num_messages=len(messages))
     
     try:
-        async with aiohttp.ClientSession() as session:
-            session, ai_url = await get_ai_agent_client(session)
-            
-            payload = {
-                "messages": [
-                    {"role": msg.role, "content": msg.content}
-                    for msg in messages
-                ],
-                "system_content": system_content
-            }
+        # Encode once up front: the same bytes key the cache and form the request body
+        payload = orjson.dumps({
+            "messages": [
+                {"role": msg.role, "content": msg.content}
+                for msg in messages
+            ],
+            "system_content": system_content
+        })
+        cache_key = "llm:" + hashlib.blake2b(payload, digest_size=16).hexdigest()
+        
+        try:
+            if cached := await redis_client.get(cache_key):
+                if restack_logger.isEnabledFor(logging.INFO):
+                    log.info("Cache hit for chat completion")
+                return _chat_decoder.decode(cached)
+        except Exception as e:
+            log.warning("Completion cache retrieval failed", error=str(e))
+        
+        if LLM_BATCHING:
+            result = await _submit_chat(payload)
+        else:
+            result = await _post_chat(payload)
+        
+        try:
+            await redis_client.setex(cache_key, LLM_CACHE_TTL, msgspec.json.encode(result))
+        except Exception as e:
+            log.warning("Failed to cache completion", error=str(e))
+        
+        return result
             
-            async with session.post(f"{ai_url}/chat", json=payload) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise FunctionFailure(
-                        f"AI agent error {response.status}: {error_text}"
-                    )
-                    
-                result = await response.json()
-                
-                if not result or "choices" not in result:
-                    raise FunctionFailure("Invalid response format from AI agent")
-                
-                choices = [
-                    ChatChoice(
-                        message=Message(
-                            role=choice["message"]["role"],
-                            content=choice["message"]["content"]
-                        ),
-                        finish_reason=choice.get("finish_reason"),
-                        index=choice.get("index", 0)
-                    )
-                    for choice in result["choices"]
-                ]
-                
-                return LlmChatResponse(
-                    choices=choices,
-                    model=result.get("model"),
-                    created=result.get("created")
-                )
-                
     except Exception as e:
         log.error("Chat processing failed", error=str(e))
         raise FunctionFailure(f"Failed to process chat: {str(e)}") from e
@@ -1,52 +1,357 @@
-from typing import Dict, List, Any
-from datetime import datetime
+import asyncio
+import copy
+import os
+import time
+import types
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Mapping, Optional, Tuple
+from datetime import datetime, timezone
 import numpy as np
-from scipy import stats
+from sortedcontainers import SortedList
+from apps.backend.monitoring._ab_kernels import ab_winner
+from apps.backend.monitoring._ks_kernels import ks_batch
 
-class ModelMonitoring:
+# Every 'timestamp' this module returns, in results and in history records alike, is an int of
+# epoch nanoseconds (formerly a local-time ISO string); serialize with _iso where a string is needed
+def _ts() -> int:
+    """Current time as integer epoch nanoseconds"""
+    return time.time_ns()
+
+def _iso(ns: int) -> str:
+    """Format an epoch-nanosecond timestamp as an ISO 8601 UTC string"""
+    return datetime.fromtimestamp(ns / 1e9, tz=timezone.utc).isoformat()
+
+# Large drift checks run off the event loop on one thread, which keeps Numba's threading
+# layer to a single caller and serializes writes to the drift history
+_drift_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='drift')
+
+# Drift checks kept in history; older ones are overwritten
+DRIFT_HISTORY_CAPACITY = int(os.getenv('DRIFT_HISTORY_CAPACITY', '10000'))
+
+# Canary deployments kept in history; older ones are overwritten
+DEPLOYMENT_HISTORY_CAPACITY = int(os.getenv('DEPLOYMENT_HISTORY_CAPACITY', '10000'))
+
+# Acceptable (low, high) band per business KPI; values outside it raise an alert
+KPI_THRESHOLDS = types.MappingProxyType({
+    'menu_margin': (0.6, 1.0),  # fraction of revenue
+    'customer_satisfaction': (4.0, 5.0),  # rating out of 5
+    'order_processing_time': (0.0, 15.0),  # minutes
+    'inventory_level': (20.0, 100.0)  # percentage
+})
+
+# (low, high) band each canary metric must fall in for the deployment to succeed
+CANARY_SUCCESS_CRITERIA = types.MappingProxyType({
+    'error_rate': (0.0, 0.01),
+    'latency_p95_ms': (0.0, 500.0),
+    'accuracy': (0.8, 1.0)
+})
+
+def _bands(thresholds: Mapping[str, Tuple[float, float]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Split a name -> (low, high) mapping into parallel name, low and high arrays"""
+    names = np.array(list(thresholds.keys()))
+    low, high = np.array(list(thresholds.values()), dtype=np.float64).reshape(-1, 2).T
+    return names, low, high
+
+def _band_values(names: np.ndarray, data: Mapping[str, float]) -> np.ndarray:
+    """Values for each banded name, NaN where missing"""
+    return np.fromiter(
+        (data.get(name, np.nan) for name in names.tolist()),
+        dtype=np.float64,
+        count=names.size
+    )
+
+def _narrowest(values: np.ndarray) -> np.ndarray:
+    """values as contiguous float32 when every value survives the conversion, else float64"""
+    narrow = np.ascontiguousarray(values, dtype=np.float32)
+    if narrow.dtype == values.dtype or np.array_equal(narrow, values, equal_nan=True):
+        return narrow
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+def _as_samples(reference: np.ndarray, current: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Both samples in one float dtype: float32 halves the bytes sorted, but only when it is exact,
+    since rounding can merge distinct values and so change the ordering KS depends on"""
+    reference, current = _narrowest(reference), _narrowest(current)
+    if reference.dtype != current.dtype:
+        return reference.astype(np.float64), current.astype(np.float64)
+    return reference, current
+
+def _ks_statistics(reference: np.ndarray, current: np.ndarray) -> np.ndarray:
+    """Two-sample KS statistic for every column of (n, d) and (m, d) samples of the same float dtype"""
+    ks_statistic = np.full(reference.shape[1], np.nan)
+    if len(reference) and len(current):
+        ks_batch(np.sort(reference, axis=0), np.sort(current, axis=0), ks_statistic)
+    return ks_statistic
+
+class _StreamWindow:
+    """Sliding window of observations kept in sorted order, with Welford running moments"""
     def __init__(self):
+        self.values = SortedList()
+        self.arrivals = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+        # Sorted array shared by every check until the window next changes
+        self._sorted: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def add(self, x: float):
+        self._sorted = None
+        self.values.add(x)
+        self.arrivals.append(x)
+        n = len(self.values)
+        delta = x - self._mean
+        self._mean += delta / n
+        self._m2 += delta * (x - self._mean)
+
+    def evict(self, count: int):
+        if count > 0:
+            self._sorted = None
+        for _ in range(min(count, len(self.arrivals))):
+            x = self.arrivals.popleft()
+            self.values.remove(x)
+            # Welford update run in reverse
+            n = len(self.values)
+            if n == 0:
+                self._mean = self._m2 = 0.0
+                continue
+            delta = x - self._mean
+            self._mean -= delta / n
+            self._m2 = max(self._m2 - delta * (x - self._mean), 0.0)
+
+    def mean(self) -> float:
+        """Window mean; NaN when the window is empty"""
+        return self._mean if self.values else float('nan')
+
+    def std(self) -> float:
+        """Population standard deviation; NaN when the window is empty"""
+        return float(np.sqrt(self._m2 / len(self.values))) if self.values else float('nan')
+
+    def sorted_column(self) -> np.ndarray:
+        if self._sorted is None:
+            values = np.fromiter(self.values, dtype=np.float64, count=len(self.values))
+            self._sorted = _narrowest(values).reshape(-1, 1)
+            self._sorted.flags.writeable = False
+        return self._sorted
+
+class _DriftHistory:
+    """Fixed-capacity ring of drift check results stored column-wise"""
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamp_ns = np.empty(capacity, dtype=np.int64)
+        self.feature = np.empty(capacity, dtype=np.int64)
+        self.ks_statistic = np.empty(capacity, dtype=np.float64)
+        self.p_value = np.empty(capacity, dtype=np.float64)
+        self.drift_detected = np.empty(capacity, dtype=np.bool_)
+        self.mean_difference = np.empty(capacity, dtype=np.float64)
+        self.std_difference = np.empty(capacity, dtype=np.float64)
+        self.head = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(
+        self,
+        timestamp_ns: int,
+        feature: int,
+        ks_statistic: float,
+        p_value: float,
+        drift_detected: bool,
+        mean_difference: float,
+        std_difference: float
+    ):
+        i = self.head
+        self.timestamp_ns[i] = timestamp_ns
+        self.feature[i] = feature
+        self.ks_statistic[i] = ks_statistic
+        self.p_value[i] = p_value
+        self.drift_detected[i] = drift_detected
+        self.mean_difference[i] = mean_difference
+        self.std_difference[i] = std_difference
+        self.head = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Materialize the history as dicts, oldest first"""
+        order = np.arange(self.head - self.size, self.head) % self.capacity
+        return [
+            {
+                'timestamp': ts,
+                'feature': feature,
+                'drift_detected': drift,
+                'ks_statistic': ks,
+                'p_value': p,
+                'metrics': {
+                    'mean_difference': mean_difference,
+                    'std_difference': std_difference
+                }
+            }
+            for ts, feature, drift, ks, p, mean_difference, std_difference in zip(
+                self.timestamp_ns[order].tolist(),
+                self.feature[order].tolist(),
+                self.drift_detected[order].tolist(),
+                self.ks_statistic[order].tolist(),
+                self.p_value[order].tolist(),
+                self.mean_difference[order].tolist(),
+                self.std_difference[order].tolist()
+            )
+        ]
+
+class ModelMonitoring:
+    # scipy.special.kolmogorov, imported on the first drift check so workers that never monitor skip scipy
+    _kolmogorov = None
+
+    def __init__(self, kpi_thresholds: Mapping[str, Tuple[float, float]] = KPI_THRESHOLDS):
         self.data_drift_threshold = 0.05  # 5% threshold for KS test
+        # Parallel arrays so every KPI band is checked in one vectorized comparison
+        self._kpi_names, self._kpi_low, self._kpi_high = _bands(kpi_thresholds)
+        self._last_kpi_key = None
+        self._last_kpi_result = None
         self.performance_metrics = {}
-        self.drift_history = []
+        self._drift_history = _DriftHistory(DRIFT_HISTORY_CAPACITY)
+        self.reference_window = _StreamWindow()
+        self.current_window = _StreamWindow()
+
+    def monitor_data_drift(self, reference_data: np.ndarray, current_data: np.ndarray) -> Dict[str, Any]:
+        """Monitor data drift using Kolmogorov-Smirnov test; 2-D (n, d) inputs test every feature at once"""
+        reference, current = _as_samples(np.asarray(reference_data), np.asarray(current_data))
+        single_feature = reference.ndim == 1
+        reference = reference.reshape(len(reference), -1)
+        current = current.reshape(len(current), -1)
+
+        return self._record_drift(
+            _ks_statistics(reference, current),
+            len(reference),
+            len(current),
+            current.mean(axis=0, dtype=np.float64) - reference.mean(axis=0, dtype=np.float64),
+            current.std(axis=0, dtype=np.float64) - reference.std(axis=0, dtype=np.float64),
+            single_feature=single_feature
+        )
+
+    async def monitor_data_drift_async(self, reference_data: np.ndarray, current_data: np.ndarray) -> Dict[str, Any]:
+        """Run monitor_data_drift on the drift executor so large checks do not block the event loop"""
+        return await asyncio.get_running_loop().run_in_executor(
+            _drift_executor, self.monitor_data_drift, reference_data, current_data
+        )
+
+    def add_reference(self, x: float):
+        """Add an observation to the streaming reference window"""
+        self.reference_window.add(x)
+
+    def add_current(self, x: float):
+        """Add an observation to the streaming current window"""
+        self.current_window.add(x)
+
+    def evict(self, reference: int = 0, current: int = 0):
+        """Drop the oldest observations from the streaming reference and current windows"""
+        self.reference_window.evict(reference)
+        self.current_window.evict(current)
 
-    async def monitor_data_drift(self, reference_data: np.ndarray, current_data: np.ndarray) -> Dict[str, Any]:
-        """Monitor data drift using Kolmogorov-Smirnov test"""
-        ks_statistic, p_value = stats.ks_2samp(reference_data, current_data)
+    def monitor_stream_drift(
+        self,
+        reference: Optional[_StreamWindow] = None,
+        current: Optional[_StreamWindow] = None
+    ) -> Dict[str, Any]:
+        """Monitor data drift between streaming windows, the monitor's own by default, without re-sorting them"""
+        if reference is None:
+            reference = self.reference_window
+        if current is None:
+            current = self.current_window
+        ks_statistic = np.full(1, np.nan)
+        # An empty window has no distribution to compare, so the check reports NaN and no drift
+        if reference and current:
+            ks_batch(*_as_samples(reference.sorted_column(), current.sorted_column()), ks_statistic)
+
+        return self._record_drift(
+            ks_statistic,
+            len(reference),
+            len(current),
+            np.array([current.mean() - reference.mean()]),
+            np.array([current.std() - reference.std()]),
+            single_feature=True
+        )
+
+    @property
+    def drift_history(self) -> List[Dict[str, Any]]:
+        """Recorded drift checks, oldest first; multi-feature checks keep their most-drifted feature"""
+        return self._drift_history.to_records()
+
+    def _record_drift(
+        self,
+        ks_statistic: np.ndarray,
+        n: int,
+        m: int,
+        mean_difference: np.ndarray,
+        std_difference: np.ndarray,
+        single_feature: bool
+    ) -> Dict[str, Any]:
+        """Build and record a drift result from per-feature KS statistics"""
+        kolmogorov = ModelMonitoring._kolmogorov
+        if kolmogorov is None:
+            from scipy.special import kolmogorov
+            ModelMonitoring._kolmogorov = kolmogorov
+
+        # Asymptotic two-sided p-value; undefined when either sample is empty
+        if n and m:
+            p_value = kolmogorov(np.sqrt(n * m / (n + m)) * ks_statistic)
+        else:
+            p_value = np.full_like(ks_statistic, np.nan)
         
         drift_detected = p_value < self.data_drift_threshold
+
+        def per_feature(values: np.ndarray) -> Any:
+            return float(values[0]) if single_feature else values.tolist()
         
+        timestamp_ns = _ts()
         result = {
-            'timestamp': datetime.now().isoformat(),
-            'drift_detected': drift_detected,
-            'ks_statistic': float(ks_statistic),
-            'p_value': float(p_value),
+            'timestamp': timestamp_ns,
+            'drift_detected': bool(drift_detected.any()),
+            'ks_statistic': per_feature(ks_statistic),
+            'p_value': per_feature(p_value),
             'metrics': {
-                'mean_difference': float(np.mean(current_data) - np.mean(reference_data)),
-                'std_difference': float(np.std(current_data) - np.std(reference_data))
+                'mean_difference': per_feature(mean_difference),
+                'std_difference': per_feature(std_difference)
             }
         }
+        if not single_feature:
+            result['drifted_features'] = np.flatnonzero(drift_detected).tolist()
         
-        self.drift_history.append(result)
+        worst = int(np.argmax(ks_statistic))
+        self._drift_history.append(
+            timestamp_ns,
+            worst,
+            ks_statistic[worst],
+            p_value[worst],
+            drift_detected[worst],
+            mean_difference[worst],
+            std_difference[worst]
+        )
         return result
 
-    async def monitor_concept_drift(self, model_predictions: np.ndarray, actual_values: np.ndarray) -> Dict[str, Any]:
+    def monitor_concept_drift(self, model_predictions: np.ndarray, actual_values: np.ndarray) -> Dict[str, Any]:
         """Monitor concept drift using ADWIN"""
         # Implement ADWIN (Adaptive Windowing) algorithm
         pass
 
-    async def track_performance_metrics(self, model_name: str, metrics: Dict[str, float]) -> Dict[str, Any]:
+    def track_performance_metrics(self, model_name: str, metrics: Dict[str, float]) -> Dict[str, Any]:
         """Track model performance metrics"""
-        timestamp = datetime.now().isoformat()
-        
-        if model_name not in self.performance_metrics:
-            self.performance_metrics[model_name] = []
-            
-        metric_entry = {
-            'timestamp': timestamp,
-            'metrics': metrics
-        }
+        timestamp = _ts()
         
-        self.performance_metrics[model_name].append(metric_entry)
+        # Per-metric running moments and regression sums, so history is never re-scanned
+        model_state = self.performance_metrics.setdefault(model_name, {})
+        for metric, y in metrics.items():
+            state = model_state.get(metric)
+            if state is None:
+                state = model_state[metric] = {'n': 0, 'mean': 0.0, 'M2': 0.0, 'sum_y': 0.0, 'sum_xy': 0.0}
+            x = state['n']
+            state['n'] = n = x + 1
+            delta = y - state['mean']
+            state['mean'] += delta / n
+            state['M2'] += delta * (y - state['mean'])
+            state['sum_y'] += y
+            state['sum_xy'] += x * y
         
         return {
             'timestamp': timestamp,
@@ -55,10 +360,16 @@ class ModelMonitoring:
             'historical_trend': self.calculate_metric_trends(model_name)
         }
 
-    async def monitor_business_kpis(self, kpi_data: Dict[str, float]) -> Dict[str, Any]:
-        """Monitor business KPIs"""
-        return {
-            'timestamp': datetime.now().isoformat(),
+    def monitor_business_kpis(self, kpi_data: Dict[str, float]) -> Dict[str, Any]:
+        """Monitor business KPIs; a poll with unchanged KPI values returns a copy of the previous result"""
+        key = tuple(sorted(kpi_data.items()))
+        # Callers get their own copy, so mutating a result cannot change what later polls return
+        if key == self._last_kpi_key:
+            return copy.deepcopy(self._last_kpi_result)
+        
+        self._last_kpi_key = key
+        self._last_kpi_result = {
+            'timestamp': _ts(),
             'kpi_metrics': {
                 'menu_margin_impact': self.calculate_menu_margin_impact(kpi_data),
                 'customer_satisfaction': self.calculate_customer_satisfaction(kpi_data),
@@ -66,25 +377,28 @@ class ModelMonitoring:
             },
             'alerts': self.generate_kpi_alerts(kpi_data)
         }
+        return copy.deepcopy(self._last_kpi_result)
 
     def calculate_metric_trends(self, model_name: str) -> Dict[str, Any]:
         """Calculate trends in model metrics over time"""
-        if model_name not in self.performance_metrics:
-            return {}
-            
-        history = self.performance_metrics[model_name]
-        if not history:
+        model_state = self.performance_metrics.get(model_name)
+        if not model_state:
             return {}
             
-        metrics = history[0]['metrics'].keys()
         trends = {}
         
-        for metric in metrics:
-            values = [entry['metrics'][metric] for entry in history]
+        for metric, state in model_state.items():
+            n = state['n']
+            # Least-squares slope of the metric against its observation index 0..n-1,
+            # whose sums have closed forms and need no running state
+            sum_x = n * (n - 1) / 2
+            sum_x2 = n * (n - 1) * (2 * n - 1) / 6
+            denominator = n * sum_x2 - sum_x * sum_x
+            slope = (n * state['sum_xy'] - sum_x * state['sum_y']) / denominator if denominator else 0.0
             trends[metric] = {
-                'mean': float(np.mean(values)),
-                'std': float(np.std(values)),
-                'trend': 'increasing' if np.polyfit(range(len(values)), values, 1)[0] > 0 else 'decreasing'
+                'mean': float(state['mean']),
+                'std': float(np.sqrt(state['M2'] / n)),
+                'trend': 'increasing' if slope > 0 else 'decreasing'
             }
             
         return trends
@@ -103,17 +417,84 @@ class ModelMonitoring:
 
     def generate_kpi_alerts(self, kpi_data: Dict[str, float]) -> List[Dict[str, Any]]:
         """Generate alerts based on KPI thresholds"""
-        pass
+        # Missing KPIs are NaN and compare false on both sides, so they never alert
+        values = _band_values(self._kpi_names, kpi_data)
+        violated = np.flatnonzero((values < self._kpi_low) | (values > self._kpi_high))
+        
+        timestamp = _ts()
+        return [
+            {
+                'kpi': kpi,
+                'value': kpi_data[kpi],
+                'low': low,
+                'high': high,
+                'timestamp': timestamp
+            }
+            for kpi, low, high in zip(
+                self._kpi_names[violated].tolist(),
+                self._kpi_low[violated].tolist(),
+                self._kpi_high[violated].tolist()
+            )
+        ]
+
+class _DeploymentHistory:
+    """Fixed-capacity ring of canary deployments stored column-wise"""
+    STATUSES = ('active', 'success', 'failed')
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamp_ns = np.empty(capacity, dtype=np.int64)
+        self.model_name = np.empty(capacity, dtype=object)
+        self.model_version = np.empty(capacity, dtype=object)
+        self.traffic_percentage = np.empty(capacity, dtype=np.float32)
+        self.status = np.empty(capacity, dtype=np.uint8)
+        self.head = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, timestamp_ns: int, model_name: str, model_version: str, traffic_percentage: float, status: str):
+        i = self.head
+        self.timestamp_ns[i] = timestamp_ns
+        self.model_name[i] = model_name
+        self.model_version[i] = model_version
+        self.traffic_percentage[i] = traffic_percentage
+        self.status[i] = self.STATUSES.index(status)
+        self.head = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def to_dict(self, i: int) -> Dict[str, Any]:
+        """The i-th recorded deployment, oldest first, as a dict"""
+        if not 0 <= i < self.size:
+            raise IndexError(i)
+        slot = (self.head - self.size + i) % self.capacity
+        return {
+            'timestamp': int(self.timestamp_ns[slot]),
+            'model_name': self.model_name[slot],
+            'model_version': self.model_version[slot],
+            'traffic_percentage': float(self.traffic_percentage[slot]),
+            'status': self.STATUSES[self.status[slot]]
+        }
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        return [self.to_dict(i) for i in range(self.size)]
 
 class CanaryDeployment:
-    def __init__(self):
-        self.deployment_history = []
+    def __init__(self, success_criteria: Mapping[str, Tuple[float, float]] = CANARY_SUCCESS_CRITERIA):
+        self._deployment_history = _DeploymentHistory(DEPLOYMENT_HISTORY_CAPACITY)
         self.active_deployments = {}
+        self._criteria_names, self._criteria_low, self._criteria_high = _bands(success_criteria)
+
+    @property
+    def deployment_history(self) -> List[Dict[str, Any]]:
+        """Recorded canary deployments, oldest first"""
+        return self._deployment_history.to_records()
 
     async def deploy_canary(self, model_name: str, model_version: str, traffic_percentage: float = 10) -> Dict[str, Any]:
         """Deploy a model using canary deployment"""
         deployment = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _ts(),
             'model_name': model_name,
             'model_version': model_version,
             'traffic_percentage': traffic_percentage,
@@ -121,7 +502,9 @@ class CanaryDeployment:
         }
         
         self.active_deployments[model_name] = deployment
-        self.deployment_history.append(deployment)
+        self._deployment_history.append(
+            deployment['timestamp'], model_name, model_version, traffic_percentage, 'active'
+        )
         
         return deployment
 
@@ -132,7 +515,7 @@ class CanaryDeployment:
             
         deployment = self.active_deployments[model_name]
         evaluation = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _ts(),
             'model_name': model_name,
             'model_version': deployment['model_version'],
             'metrics': metrics,
@@ -143,18 +526,29 @@ class CanaryDeployment:
 
     def check_success_criteria(self, metrics: Dict[str, float]) -> bool:
         """Check if the canary deployment meets success criteria"""
-        # Implement success criteria checking
-        pass
+        # A missing metric is NaN, fails both comparisons and so fails the canary
+        values = _band_values(self._criteria_names, metrics)
+        return bool(np.all((values >= self._criteria_low) & (values <= self._criteria_high)))
+
+def _summary_arrays(summaries: List[Dict[str, float]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Mean, variance and sample-size arrays from per-model summaries, NaN where missing"""
+    return tuple(
+        np.fromiter((summary.get(key, np.nan) for summary in summaries), dtype=np.float64, count=len(summaries))
+        for key in ('mean', 'variance', 'n')
+    )
 
 class ABTesting:
-    def __init__(self):
+    WINNERS = ('model_a', 'model_b')
+
+    def __init__(self, significance_level: float = 0.05):
         self.active_tests = {}
         self.test_results = []
+        self.significance_level = significance_level
 
     async def start_ab_test(self, model_a: str, model_b: str, test_duration_days: int) -> Dict[str, Any]:
         """Start an A/B test between two models"""
         test = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _ts(),
             'model_a': model_a,
             'model_b': model_b,
             'duration_days': test_duration_days,
@@ -172,24 +566,39 @@ class ABTesting:
             raise ValueError(f"No active A/B test found with id {test_id}")
             
         test = self.active_tests[test_id]
+        # One kernel call yields both the winner and the confidence level
+        winner, p_value = self.compare_results([results])
         test_results = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _ts(),
             'test_id': test_id,
             'model_a_metrics': results.get('model_a_metrics', {}),
             'model_b_metrics': results.get('model_b_metrics', {}),
-            'winner': self.determine_winner(results),
-            'confidence_level': self.calculate_confidence_level(results)
+            'winner': self._winner_name(winner[0], p_value[0]),
+            'confidence_level': float(1.0 - p_value[0])
         }
         
         self.test_results.append(test_results)
         return test_results
 
+    def compare_results(self, results: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Welch's t-test for many A/B tests at once from the mean, variance and n summaries of each model"""
+        a_means, a_vars, a_ns = _summary_arrays([r.get('model_a_metrics', {}) for r in results])
+        b_means, b_vars, b_ns = _summary_arrays([r.get('model_b_metrics', {}) for r in results])
+        winner = np.empty(len(results), dtype=np.int64)
+        p_value = np.empty(len(results))
+        ab_winner(a_means, a_vars, a_ns, b_means, b_vars, b_ns, winner, p_value)
+        return winner, p_value
+
+    def _winner_name(self, winner: int, p_value: float) -> str:
+        # NaN p-values from missing summaries fail the comparison and count as inconclusive
+        return self.WINNERS[winner] if p_value < self.significance_level else 'inconclusive'
+
     def determine_winner(self, results: Dict[str, Any]) -> str:
         """Determine the winning model from A/B test results"""
-        # Implement winner determination logic
-        pass
+        winner, p_value = self.compare_results([results])
+        return self._winner_name(winner[0], p_value[0])
 
     def calculate_confidence_level(self, results: Dict[str, Any]) -> float:
         """Calculate confidence level for A/B test results"""
-        # Implement confidence level calculation
-        pass
\ No newline at end of file
+        _, p_value = self.compare_results([results])
+        return float(1.0 - p_value[0])
\ No newline at end of file
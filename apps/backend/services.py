@@ -1,13 +1,18 @@
 import asyncio
 import os
-from watchfiles import run_process
+import sys
+from watchfiles import PythonFilter, run_process
 import webbrowser
 from restack_ai import Restack
+from apps.backend.core.connections import close_db_pool, close_http_session, prewarm_connections
 from apps.backend.functions import my_custom_function, another_custom_function, lookup_sales, llm_chat
 from apps.backend.agents import Agent1, Agent2, AgentRag
 
 client = Restack()
 
+# File watching and auto-reload are for local development only
+RESTACK_DEV = os.getenv("RESTACK_DEV") == "1"
+
 async def custom_service_1():
     await client.start_service(
         agents=[Agent1],
@@ -23,19 +28,35 @@ async def custom_service_2():
     )
 
 async def main():
+    # Connect and exercise the sales lookup pools before accepting work
+    await prewarm_connections()
     await client.start_service(agents=[AgentRag], functions=[lookup_sales, llm_chat])
 
 async def run_services():
-    await asyncio.gather(custom_service_1(), custom_service_2(), main())
+    try:
+        await asyncio.gather(custom_service_1(), custom_service_2(), main())
+    finally:
+        # Flush rows still buffered in data pipelines; if the module was never imported there are none
+        if (data_pipeline := sys.modules.get('apps.backend.core.data_pipeline')) is not None:
+            await data_pipeline.close_pipelines()
+        await close_http_session()
+        await close_db_pool()
 
 def watch_services():
+    if not RESTACK_DEV:
+        # Outside development run the services directly, without a reloader scanning the tree
+        asyncio.run(run_services())
+        return
     watch_path = os.getcwd()
     print(f"Watching {watch_path} and its subdirectories for changes...")
     webbrowser.open("http://localhost:5233")
-    run_process(watch_path, recursive=True, target=run_services)
+    run_process(watch_path, recursive=True, target=run_services, watch_filter=PythonFilter())
 
 if __name__ == "__main__":
     try:
-        asyncio.run(run_services())
+        if RESTACK_DEV:
+            watch_services()
+        else:
+            asyncio.run(run_services())
     except KeyboardInterrupt:
         print("Service interrupted by user. Exiting gracefully.")
@@ -8,6 +8,10 @@ with import_functions():
     from apps.backend.functions.hn.search import tool_hn_search
     from apps.backend.workflows.child_workflow import my_child_workflow
 
+# Step inputs that are the same on every run are built once at import
+STEP_TIMEOUT = timedelta(seconds=10)
+HN_SEARCH_INPUT = HnSearchInput(query="ai")
+
 @dataclass
 class WorkflowInputParams(BaseModel):
     pass
@@ -16,11 +20,11 @@ class WorkflowInputParams(BaseModel):
 class AutomatedWorkflow:
     @workflow.run
     async def run(self, input: WorkflowInputParams):
-        hn_results = await workflow.step(tool_hn_search, HnSearchInput(query="ai"), start_to_close_timeout=timedelta(seconds=10))
+        hn_results = await workflow.step(tool_hn_search, HN_SEARCH_INPUT, start_to_close_timeout=STEP_TIMEOUT)
 
         user_content = f"You are a personal assistant. Here is the latest hacker news data: {str(hn_results)} Create a todo for me to contact the founder with a one sentence summary of their product"
 
-        result = await workflow.step(openai_todos, FunctionInputParams(user_content=user_content), start_to_close_timeout=timedelta(seconds=10))
+        result = await workflow.step(openai_todos, FunctionInputParams(user_content=user_content), start_to_close_timeout=STEP_TIMEOUT)
 
         return {"result": result}
 
@@ -1,87 +1,208 @@
-from typing import Dict, List, Any
+import hashlib
+import math
+import os
+from typing import Dict, Iterator, List, Any, Mapping, Optional, Tuple
 from datetime import datetime
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-from jinja2 import Template
+from jinja2 import DictLoader, Environment, FileSystemBytecodeCache
+from tsdownsample import MinMaxLTTBDownsampler
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
 import streamlit as st
 import aiohttp
 import asyncio
-import json
+import atexit
+import threading
+import types
+import orjson
+from cachetools import TTLCache
 from . import config
 
+# Seconds a fetched payload is reused across Streamlit re-runs
+DASHBOARD_CACHE_TTL = 60
+
+# Compiled report templates are shared between processes through this directory
+REPORT_TEMPLATE_CACHE_DIR = os.getenv('REPORT_TEMPLATE_CACHE_DIR', '.jinja_cache')
+
+@st.cache_resource
+def _response_cache() -> Tuple[TTLCache, threading.Lock]:
+    # st.cache_data cannot memoize coroutines, so results are kept in a shared TTL cache instead;
+    # every session reruns on its own thread and TTLCache is not thread-safe, hence the lock
+    return TTLCache(maxsize=64, ttl=DASHBOARD_CACHE_TTL), threading.Lock()
+
+def _cached_response(key: str, default: Any = None) -> Any:
+    """Payload fetched for key within the last DASHBOARD_CACHE_TTL seconds, else default"""
+    cache, lock = _response_cache()
+    with lock:
+        return cache.get(key, default)
+
+def _cache_response(key: str, value: Any):
+    cache, lock = _response_cache()
+    with lock:
+        cache[key] = value
+
+@st.cache_resource
+def _open_sessions() -> List[Any]:
+    # Process-wide registry of (loop, session) pairs, closed once at interpreter exit
+    sessions = []
+    atexit.register(_close_sessions, sessions)
+    return sessions
+
+def _close_sessions(sessions: List[Any]):
+    for loop, session in sessions:
+        if not session.closed and not loop.is_closed():
+            loop.run_until_complete(session.close())
+
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """Get the event loop reused by every re-run of this browser session"""
+    # A session is bound to its loop, and asyncio.run would close the loop after each re-run
+    if '_event_loop' not in st.session_state:
+        st.session_state['_event_loop'] = asyncio.new_event_loop()
+    return st.session_state['_event_loop']
+
+async def get_session() -> aiohttp.ClientSession:
+    """Get the keep-alive HTTP session shared across re-runs of this browser session"""
+    session = st.session_state.get('_http_session')
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=200, keepalive_timeout=60)
+        )
+        st.session_state['_http_session'] = session
+        _open_sessions().append((asyncio.get_running_loop(), session))
+    return session
+
+# Series longer than this are downsampled with LTTB before plotting
+MAX_PLOT_POINTS = 10_000
+
+def _downsample(y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Pick at most MAX_PLOT_POINTS points that keep the visual shape of a series"""
+    x = np.arange(y.size)
+    if y.size <= MAX_PLOT_POINTS:
+        return x, y
+    idx = MinMaxLTTBDownsampler().downsample(y, n_out=MAX_PLOT_POINTS)
+    return x[idx], y[idx]
+
+def _figures_to_json(figs: Dict[str, go.Figure]) -> Dict[str, str]:
+    return {name: fig.to_json(validate=False, pretty=False) for name, fig in figs.items()}
+
+# Metrics summarised by generate_insights, with their display labels
+INSIGHT_METRICS = {
+    'revenue': 'Revenue',
+    'customer_satisfaction': 'Customer satisfaction',
+    'market_share': 'Market share'
+}
+
 class ExecutiveDashboard:
     def __init__(self):
-        self.metrics = {}
+        self.metrics: Dict[str, np.ndarray] = {}
+        self.updated_at = None
         self.insights = []
         self.alerts = []
+        # Figures and their JSON are built once per metrics update
+        self._figures: Optional[Dict[str, go.Figure]] = None
+        self._figures_json: Optional[Dict[str, str]] = None
 
-    def update_metrics(self, new_metrics: Dict[str, float]):
+    def update_metrics(self, new_metrics: Dict[str, Any]):
         """Update dashboard metrics"""
+        self._figures = self._figures_json = None
+        self.updated_at = datetime.now().isoformat()
         self.metrics.update({
-            'timestamp': datetime.now().isoformat(),
-            **new_metrics
+            name: np.asarray(values, dtype=np.float64)
+            for name, values in new_metrics.items()
         })
 
     def generate_insights(self, data: Dict[str, Any]) -> List[str]:
         """Generate automated insights using NLP"""
-        insights = []
-        
-        # Revenue insights
-        if 'revenue' in data:
-            trend = self.analyze_trend(data['revenue'])
-            insights.append(f"Revenue is {trend['direction']} by {trend['percentage']}%")
-        
-        # Customer insights
-        if 'customer_satisfaction' in data:
-            sat_trend = self.analyze_trend(data['customer_satisfaction'])
-            insights.append(f"Customer satisfaction is {sat_trend['direction']} by {sat_trend['percentage']}%")
+        series = {name: data[name] for name in INSIGHT_METRICS if name in data}
+        trends = self.analyze_trends(series)
         
-        # Market position insights
-        if 'market_share' in data:
-            market_trend = self.analyze_trend(data['market_share'])
-            insights.append(f"Market share is {market_trend['direction']} by {market_trend['percentage']}%")
+        insights = [
+            f"{INSIGHT_METRICS[name]} is {trend['direction']} by {trend['percentage']}%"
+            for name, trend in trends.items()
+        ]
         
         self.insights = insights
         return insights
 
     def analyze_trend(self, data: List[float]) -> Dict[str, Any]:
         """Analyze trend in time series data"""
-        if len(data) < 2:
-            return {'direction': 'unchanged', 'percentage': 0}
+        return self.analyze_trends({'series': data})['series']
+
+    def analyze_trends(self, data_dict: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Analyze trends for several series in one vectorized pass"""
+        arrays = {name: np.asarray(values, dtype=np.float64) for name, values in data_dict.items()}
+        trends = {name: {'direction': 'unchanged', 'percentage': 0} for name, arr in arrays.items() if arr.size < 2}
+        names = [name for name, arr in arrays.items() if arr.size >= 2]
+        if not names:
+            return trends
         
-        change = ((data[-1] - data[0]) / data[0]) * 100
-        direction = 'increasing' if change > 0 else 'decreasing'
+        first = np.array([arrays[name][0] for name in names])
+        last = np.array([arrays[name][-1] for name in names])
+        # Growth from a zero baseline is undefined; those series report as unchanged
+        defined = first != 0
+        change = np.divide(last - first, first, out=np.zeros_like(first), where=defined) * 100.0
+        increasing = np.sign(change) > 0
+        percentage = np.abs(np.round(change, 2))
         
-        return {
-            'direction': direction,
-            'percentage': abs(round(change, 2))
-        }
+        for name, ok, up, pct in zip(names, defined.tolist(), increasing.tolist(), percentage.tolist()):
+            trends[name] = {
+                'direction': ('increasing' if up else 'decreasing') if ok else 'unchanged',
+                'percentage': pct
+            }
+        return {name: trends[name] for name in arrays}
 
     def create_visualizations(self) -> Dict[str, go.Figure]:
         """Create dashboard visualizations"""
+        if self._figures is not None:
+            return self._figures
         figs = {}
         
-        # Revenue trend
+        # Revenue trend, rendered with WebGL
         if 'revenue' in self.metrics:
+            x, y = _downsample(self.metrics['revenue'])
             fig = go.Figure()
-            fig.add_trace(go.Scatter(y=self.metrics['revenue'], name='Revenue'))
+            fig.add_trace(go.Scattergl(x=x, y=y, name='Revenue'))
             figs['revenue_trend'] = fig
         
         # Customer satisfaction
         if 'customer_satisfaction' in self.metrics:
+            x, y = _downsample(self.metrics['customer_satisfaction'])
             fig = go.Figure()
-            fig.add_trace(go.Bar(y=self.metrics['customer_satisfaction'], name='Satisfaction'))
+            fig.add_trace(go.Bar(x=x, y=y, name='Satisfaction'))
             figs['satisfaction'] = fig
         
+        self._figures = figs
         return figs
 
+    def visualizations_json(self) -> Dict[str, str]:
+        """Get the dashboard visualizations serialized once for the frontend"""
+        if self._figures_json is None:
+            self._figures_json = _figures_to_json(self.create_visualizations())
+        return self._figures_json
+
+# Operational alert thresholds, read-only so the shared default cannot drift
+ANOMALY_THRESHOLDS = types.MappingProxyType({
+    'order_processing_time': 15,  # minutes
+    'inventory_level': 20,  # percentage
+    'customer_wait_time': 30  # minutes
+})
+
 class OperationalDashboard:
-    def __init__(self):
+    def __init__(self, thresholds: Mapping[str, float] = ANOMALY_THRESHOLDS):
         self.real_time_metrics = {}
         self.alerts = []
+        self._charts: Optional[Dict[str, go.Figure]] = None
+        self._charts_json: Optional[Dict[str, str]] = None
+        # Parallel arrays so every threshold is checked in one vectorized comparison
+        self._thresh_keys = np.array(list(thresholds.keys()))
+        self._thresh_vals = np.array(list(thresholds.values()), dtype=np.float64)
 
     def update_real_time_metrics(self, metrics: Dict[str, float]):
         """Update real-time operational metrics"""
+        self._charts = self._charts_json = None
         self.real_time_metrics.update({
             'timestamp': datetime.now().isoformat(),
             **metrics
@@ -89,29 +210,32 @@ class OperationalDashboard:
 
     def check_anomalies(self, data: Dict[str, float]) -> List[Dict[str, Any]]:
         """Check for anomalies in metrics"""
-        anomalies = []
+        # Missing metrics compare as -inf and can never exceed their threshold
+        vals = np.fromiter(
+            (data.get(k, -np.inf) for k in self._thresh_keys.tolist()),
+            dtype=np.float64,
+            count=self._thresh_keys.size
+        )
+        hits = np.flatnonzero(vals > self._thresh_vals)
         
-        # Define thresholds
-        thresholds = {
-            'order_processing_time': 15,  # minutes
-            'inventory_level': 20,  # percentage
-            'customer_wait_time': 30  # minutes
-        }
-        
-        for metric, value in data.items():
-            if metric in thresholds and value > thresholds[metric]:
-                anomalies.append({
-                    'metric': metric,
-                    'value': value,
-                    'threshold': thresholds[metric],
-                    'timestamp': datetime.now().isoformat()
-                })
+        timestamp = datetime.now().isoformat()
+        anomalies = [
+            {
+                'metric': metric,
+                'value': data[metric],
+                'threshold': threshold,
+                'timestamp': timestamp
+            }
+            for metric, threshold in zip(self._thresh_keys[hits].tolist(), self._thresh_vals[hits].tolist())
+        ]
         
         self.alerts.extend(anomalies)
         return anomalies
 
     def create_real_time_charts(self) -> Dict[str, go.Figure]:
         """Create real-time operational charts"""
+        if self._charts is not None:
+            return self._charts
         charts = {}
         
         # Order processing time
@@ -134,8 +258,15 @@ class OperationalDashboard:
             ))
             charts['inventory'] = fig
         
+        self._charts = charts
         return charts
 
+    def real_time_charts_json(self) -> Dict[str, str]:
+        """Get the real-time charts serialized once for the frontend"""
+        if self._charts_json is None:
+            self._charts_json = _figures_to_json(self.create_real_time_charts())
+        return self._charts_json
+
 class DecisionSupport:
     def __init__(self):
         self.what_if_scenarios = {}
@@ -183,49 +314,145 @@ class DecisionSupport:
         # Implement inventory optimization analysis
         pass
 
+def _is_json_native(value: Any) -> bool:
+    """True if value is built only from str-keyed dicts, lists and finite JSON scalars"""
+    # orjson also encodes datetimes, tuples, enums, NaN and subclasses, whose dumps collide
+    # with plain values that render differently, so those are left out of the render memo
+    kind = type(value)
+    if kind is float:
+        return math.isfinite(value)
+    if kind in (str, int, bool) or value is None:
+        return True
+    if kind is list:
+        return all(map(_is_json_native, value))
+    if kind is dict:
+        return all(type(k) is str and _is_json_native(v) for k, v in value.items())
+    return False
+
 class ReportGeneration:
     def __init__(self):
+        # Template sources, served to the environment by name
         self.templates = {}
+        os.makedirs(REPORT_TEMPLATE_CACHE_DIR, exist_ok=True)
+        # One shared environment; compiled bytecode is reused across processes and restarts
+        self.env = Environment(
+            loader=DictLoader(self.templates),
+            bytecode_cache=FileSystemBytecodeCache(REPORT_TEMPLATE_CACHE_DIR),
+            auto_reload=False,
+            optimized=True,
+            cache_size=400,
+            enable_async=False
+        )
+        # Rendered output for repeated (template, data) pairs
+        self._rendered = TTLCache(maxsize=256, ttl=DASHBOARD_CACHE_TTL)
 
     def add_template(self, name: str, template_string: str):
         """Add a report template"""
-        self.templates[name] = Template(template_string)
+        if name in self.templates:
+            # auto_reload is off, so drop the stale compiled template and its renders
+            self.env.cache.clear()
+            self._rendered.clear()
+        self.templates[name] = template_string
 
     def generate_report(self, template_name: str, data: Dict[str, Any]) -> str:
         """Generate report using template"""
         if template_name not in self.templates:
             raise ValueError(f"Template {template_name} not found")
         
-        return self.templates[template_name].render(**data)
+        if not _is_json_native(data):
+            # Data whose JSON form is not canonical is rendered without memoization
+            return self.env.get_template(template_name).render(**data)
+        
+        try:
+            digest = hashlib.blake2b(orjson.dumps(data, option=orjson.OPT_SORT_KEYS), digest_size=16).digest()
+        except TypeError:
+            # Integers beyond 64 bits
+            return self.env.get_template(template_name).render(**data)
+        
+        key = (template_name, digest)
+        if key not in self._rendered:
+            self._rendered[key] = self.env.get_template(template_name).render(**data)
+        return self._rendered[key]
+
+    def generate_report_stream(self, template_name: str, data: Dict[str, Any]) -> Iterator[str]:
+        """Generate report as a stream of chunks for piping to a response writer"""
+        if template_name not in self.templates:
+            raise ValueError(f"Template {template_name} not found")
+        
+        return self.env.get_template(template_name).generate(**data)
+
+class _IntegrationRequest(BaseModel):
+    """Integration payloads are open-ended; validation runs in pydantic-core and fields pass through."""
+    model_config = ConfigDict(extra='allow')
+
+class PosRecRequest(_IntegrationRequest):
+    """POS recommendation request."""
+
+class InventoryAlertRequest(_IntegrationRequest):
+    """Inventory alert request."""
+
+class MarketingSuggestRequest(_IntegrationRequest):
+    """Marketing suggestion request."""
 
 class IntegrationPoints:
     def __init__(self):
-        self.app = FastAPI()
+        self.app = FastAPI(default_response_class=ORJSONResponse)
+        self._session = None
+        # The snapshot is shared by every dashboard client for DASHBOARD_CACHE_TTL seconds
+        self._snapshot_cache = TTLCache(maxsize=1, ttl=DASHBOARD_CACHE_TTL)
+        
+        @self.app.get("/dashboard/snapshot")
+        async def dashboard_snapshot():
+            """Aggregate all dashboard data into one response"""
+            try:
+                return await self.generate_dashboard_snapshot()
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e))
         
         @self.app.post("/pos/recommendations")
-        async def pos_recommendations(data: Dict[str, Any]):
+        async def pos_recommendations(data: PosRecRequest):
             """Generate POS system recommendations"""
             try:
-                return await self.generate_pos_recommendations(data)
+                return await self.generate_pos_recommendations(data.model_dump())
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
         
         @self.app.post("/inventory/alerts")
-        async def inventory_alerts(data: Dict[str, Any]):
+        async def inventory_alerts(data: InventoryAlertRequest):
             """Generate inventory management alerts"""
             try:
-                return await self.generate_inventory_alerts(data)
+                return await self.generate_inventory_alerts(data.model_dump())
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
         
         @self.app.post("/marketing/suggestions")
-        async def marketing_suggestions(data: Dict[str, Any]):
+        async def marketing_suggestions(data: MarketingSuggestRequest):
             """Generate marketing campaign suggestions"""
             try:
-                return await self.generate_marketing_suggestions(data)
+                return await self.generate_marketing_suggestions(data.model_dump())
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
 
+    async def generate_dashboard_snapshot(self) -> Dict[str, Any]:
+        """Gather executive, operational and recommendation data server-side"""
+        if 'snapshot' in self._snapshot_cache:
+            return self._snapshot_cache['snapshot']
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=200, keepalive_timeout=60)
+            )
+        executive, operational, recommendations = await asyncio.gather(
+            request_metrics(self._session, "executive_metrics"),
+            request_metrics(self._session, "operational_metrics"),
+            request_recommendations(self._session)
+        )
+        self._snapshot_cache['snapshot'] = snapshot = {
+            'executive': executive,
+            'operational': operational,
+            'recommendations': recommendations
+        }
+        return snapshot
+
     async def generate_pos_recommendations(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate POS system recommendations"""
         # Implement POS recommendations
@@ -241,29 +468,52 @@ class IntegrationPoints:
         # Implement marketing suggestions
         pass
 
+async def _get_json(session: aiohttp.ClientSession, url: str) -> Any:
+    """GET a JSON document, raising on a non-200 response"""
+    async with session.get(url) as response:
+        if response.status != 200:
+            raise aiohttp.ClientResponseError(
+                response.request_info, response.history, status=response.status, message=await response.text()
+            )
+        return orjson.loads(await response.read())
+
+async def request_metrics(session: aiohttp.ClientSession, endpoint: str) -> Dict[str, Any]:
+    """Fetch metrics from the backend API; plain aiohttp, usable outside Streamlit"""
+    return await _get_json(session, f"{config.BACKEND_API_URL}/{endpoint}")
+
+async def request_recommendations(session: aiohttp.ClientSession) -> List[str]:
+    """Fetch AI-generated recommendations; plain aiohttp, usable outside Streamlit"""
+    data = await _get_json(session, f"{config.AI_AGENT_URL}/recommendations")
+    return data.get('recommendations', [])
+
 async def fetch_metrics(session: aiohttp.ClientSession, endpoint: str) -> Dict[str, Any]:
     """Fetch metrics from backend API"""
+    data = _cached_response(endpoint)
+    if data is not None:
+        return data
     try:
-        async with session.get(f"{config.BACKEND_API_URL}/{endpoint}") as response:
-            if response.status == 200:
-                return await response.json()
-            else:
-                st.error(f"Error fetching {endpoint}: {response.status}")
-                return {}
+        data = await request_metrics(session, endpoint)
+        _cache_response(endpoint, data)
+        return data
+    except aiohttp.ClientResponseError as e:
+        st.error(f"Error fetching {endpoint}: {e.status}")
+        return {}
     except Exception as e:
         st.error(f"Failed to fetch {endpoint}: {str(e)}")
         return {}
 
 async def fetch_recommendations(session: aiohttp.ClientSession) -> List[str]:
     """Fetch AI-generated recommendations"""
+    recommendations = _cached_response('recommendations')
+    if recommendations is not None:
+        return recommendations
     try:
-        async with session.get(f"{config.AI_AGENT_URL}/recommendations") as response:
-            if response.status == 200:
-                data = await response.json()
-                return data.get('recommendations', [])
-            else:
-                st.error(f"Error fetching recommendations: {response.status}")
-                return []
+        recommendations = await request_recommendations(session)
+        _cache_response('recommendations', recommendations)
+        return recommendations
+    except aiohttp.ClientResponseError as e:
+        st.error(f"Error fetching recommendations: {e.status}")
+        return []
     except Exception as e:
         st.error(f"Failed to fetch recommendations: {str(e)}")
         return []
@@ -272,58 +522,60 @@ def create_streamlit_dashboard():
     """Create Streamlit dashboard"""
     st.title("Restaurant BI Dashboard")
     
-    # Sidebar with error handling for date input
-    st.sidebar.title("Controls")
-    try:
-        date_range = st.sidebar.date_input("Select Date Range", [])
-    except Exception as e:
-        st.sidebar.error(f"Error with date input: {str(e)}")
-        date_range = []
-    
-    # Create async session and fetch data
+    # Reuse the persistent session and fetch data
     async def fetch_dashboard_data():
-        async with aiohttp.ClientSession() as session:
-            # Fetch metrics concurrently
-            exec_metrics, op_metrics, recommendations = await asyncio.gather(
-                fetch_metrics(session, "executive_metrics"),
-                fetch_metrics(session, "operational_metrics"),
-                fetch_recommendations(session)
-            )
-            
-            # Executive metrics with error handling
-            st.header("Executive Metrics")
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                revenue = exec_metrics.get('revenue', {'value': 0, 'change': '0%'})
-                st.metric("Revenue", f"${revenue['value']:,.2f}", revenue['change'])
-            with col2:
-                satisfaction = exec_metrics.get('satisfaction', {'value': 0, 'change': '0'})
-                st.metric("Customer Satisfaction", f"{satisfaction['value']}/5", satisfaction['change'])
-            with col3:
-                market = exec_metrics.get('market_share', {'value': 0, 'change': '0%'})
-                st.metric("Market Share", f"{market['value']}%", market['change'])
-            
-            # Operational metrics with error handling
-            st.header("Operational Metrics")
-            col1, col2 = st.columns(2)
-            with col1:
-                proc_time = op_metrics.get('processing_time', {'value': 0, 'change': '0'})
-                st.metric("Order Processing Time", f"{proc_time['value']} min", proc_time['change'])
-            with col2:
-                inventory = op_metrics.get('inventory', {'value': 0, 'change': '0%'})
-                st.metric("Inventory Level", f"{inventory['value']}%", inventory['change'])
-            
-            # AI-generated recommendations
-            st.header("Recommendations")
-            if recommendations:
-                for i, rec in enumerate(recommendations, 1):
-                    st.write(f"{i}. {rec}")
-            else:
-                st.info("No recommendations available at the moment")
+        session = await get_session()
+        # One aggregated request, started first so it is in flight while widgets render
+        snapshot = asyncio.ensure_future(fetch_metrics(session, "dashboard/snapshot"))
+        await asyncio.sleep(0)
+        
+        # Sidebar with error handling for date input
+        st.sidebar.title("Controls")
+        try:
+            date_range = st.sidebar.date_input("Select Date Range", [])
+        except Exception as e:
+            st.sidebar.error(f"Error with date input: {str(e)}")
+            date_range = []
+        
+        data = await snapshot
+        exec_metrics = data.get('executive', {})
+        op_metrics = data.get('operational', {})
+        recommendations = data.get('recommendations', [])
+        
+        # Executive metrics with error handling
+        st.header("Executive Metrics")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            revenue = exec_metrics.get('revenue', {'value': 0, 'change': '0%'})
+            st.metric("Revenue", f"${revenue['value']:,.2f}", revenue['change'])
+        with col2:
+            satisfaction = exec_metrics.get('satisfaction', {'value': 0, 'change': '0'})
+            st.metric("Customer Satisfaction", f"{satisfaction['value']}/5", satisfaction['change'])
+        with col3:
+            market = exec_metrics.get('market_share', {'value': 0, 'change': '0%'})
+            st.metric("Market Share", f"{market['value']}%", market['change'])
+        
+        # Operational metrics with error handling
+        st.header("Operational Metrics")
+        col1, col2 = st.columns(2)
+        with col1:
+            proc_time = op_metrics.get('processing_time', {'value': 0, 'change': '0'})
+            st.metric("Order Processing Time", f"{proc_time['value']} min", proc_time['change'])
+        with col2:
+            inventory = op_metrics.get('inventory', {'value': 0, 'change': '0%'})
+            st.metric("Inventory Level", f"{inventory['value']}%", inventory['change'])
+        
+        # AI-generated recommendations
+        st.header("Recommendations")
+        if recommendations:
+            for i, rec in enumerate(recommendations, 1):
+                st.write(f"{i}. {rec}")
+        else:
+            st.info("No recommendations available at the moment")
 
     # Run async data fetching
     try:
-        asyncio.run(fetch_dashboard_data())
+        _get_event_loop().run_until_complete(fetch_dashboard_data())
     except Exception as e:
         st.error(f"Failed to load dashboard data: {str(e)}")
 
@@ -62,8 +62,8 @@ collect_external = PythonOperator(
     dag=data_collection_dag
 )
 
-# Set task dependencies
-collect_pos >> collect_inventory >> collect_feedback >> collect_external
+# Set task dependencies: the three source collections are independent and run in parallel
+[collect_pos, collect_inventory, collect_feedback] >> collect_external
 
 # Market Analysis DAG
 market_analysis_dag = DAG(
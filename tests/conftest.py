@@ -0,0 +1,33 @@
+import importlib
+import importlib.util
+import sys
+import types
+
+# restack-ai 0.0.62 ships restack_ai.agent as a single module, without the exceptions and
+# retry submodules the agents import; stand them in here so the agent modules can be imported
+if (importlib.util.find_spec('restack_ai') is not None
+        and not hasattr(importlib.import_module('restack_ai.agent'), '__path__')):
+    exceptions = types.ModuleType('restack_ai.agent.exceptions')
+
+    class AgentError(Exception):
+        pass
+
+    class AgentTimeoutError(AgentError):
+        pass
+
+    class AgentValidationError(AgentError):
+        pass
+
+    for error in (AgentError, AgentTimeoutError, AgentValidationError):
+        error.__module__ = exceptions.__name__
+        setattr(exceptions, error.__name__, error)
+
+    retry_module = types.ModuleType('restack_ai.agent.retry')
+
+    def retry(retries=0, delay=0.0, exceptions=()):
+        return lambda fn: fn
+
+    retry_module.retry = retry
+
+    sys.modules[exceptions.__name__] = exceptions
+    sys.modules[retry_module.__name__] = retry_module
@@ -0,0 +1,47 @@
+import importlib.util
+import json
+from pathlib import Path
+import pytest
+import msgspec
+
+# apps/backend/agents.py shadows the agents/ directory, so the RAG agent is loaded by path
+_spec = importlib.util.spec_from_file_location(
+    'apps.backend.agents_rag', Path(__file__).parents[1] / 'apps' / 'backend' / 'agents' / 'agents.py'
+)
+agents = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(agents)
+AgentInput, AgentRag, EndEvent, MessageEvent = agents.AgentInput, agents.AgentRag, agents.EndEvent, agents.MessageEvent
+AgentValidationError, _validate = agents.AgentValidationError, agents._validate
+
+def _over_the_wire(value):
+    # What Restack's JSON converter does to a handler argument or result
+    return json.loads(json.dumps(value))
+
+def test_message_event_round_trips_as_plain_json():
+    event = MessageEvent(content="How were sales last week?")
+    assert _validate(_over_the_wire(msgspec.to_builtins(event)), MessageEvent) == event
+
+def test_agent_input_defaults_fill_missing_fields():
+    validated = _validate(_over_the_wire({'max_history': 10}), AgentInput)
+    assert validated.max_history == 10
+    assert validated.system_prompt == AgentInput().system_prompt
+
+def test_whitespace_message_is_rejected():
+    with pytest.raises(AgentValidationError):
+        _validate({'content': '   '}, MessageEvent)
+
+async def test_end_handler_returns_json_native_result():
+    # The instance's end flag shadows the handler, so call it through the class as Restack does
+    rag = AgentRag()
+    result = await AgentRag.end(rag, _over_the_wire({'end': True}))
+    assert rag.end is True
+    assert _over_the_wire(result) == result
+    assert _validate(result, EndEvent) == EndEvent(end=True)
+
+def test_system_prompt_is_reused_for_the_cached_sales_payload():
+    rag = AgentRag()
+    sales = agents.SalesData(data={'total': 1}, source='cache', timestamp='2024-01-01T00:00:00')
+    prompt = rag._get_system_content(sales)
+    assert rag._get_system_content(sales) is prompt
+    refreshed = agents.SalesData(data={'total': 2}, source='database', timestamp='2024-01-02T00:00:00')
+    assert "'total': 2" in rag._get_system_content(refreshed)
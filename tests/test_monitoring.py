@@ -0,0 +1,67 @@
+import numpy as np
+from apps.backend.monitoring.monitoring import ModelMonitoring
+
+def test_data_drift_with_nan_returns_nan_statistic():
+    monitor = ModelMonitoring()
+    result = monitor.monitor_data_drift(np.array([1.0, 2.0, np.nan]), np.array([1.5, 2.5, 3.0, 4.0]))
+    assert np.isnan(result['ks_statistic'])
+    assert np.isnan(result['p_value'])
+    assert result['drift_detected'] is False
+
+def test_data_drift_nan_only_affects_its_feature():
+    monitor = ModelMonitoring()
+    reference = np.column_stack([np.arange(50.0), np.arange(50.0)])
+    current = np.column_stack([np.arange(50.0) + 100, np.arange(50.0)])
+    reference[3, 1] = np.nan
+    result = monitor.monitor_data_drift(reference, current)
+    assert result['ks_statistic'][0] == 1.0
+    assert np.isnan(result['ks_statistic'][1])
+    assert result['drifted_features'] == [0]
+
+def test_kpi_alert_bands_keep_float64_thresholds():
+    monitor = ModelMonitoring()
+    alerts = monitor.generate_kpi_alerts({'menu_margin': 0.59999999})
+    assert alerts[0]['low'] == 0.6
+    assert monitor.generate_kpi_alerts({'menu_margin': 0.6}) == []
+
+def test_memoized_kpi_result_is_not_shared_with_callers():
+    monitor = ModelMonitoring()
+    kpis = {'menu_margin': 0.1}
+    first = monitor.monitor_business_kpis(kpis)
+    first['alerts'].clear()
+    assert len(monitor.monitor_business_kpis(kpis)['alerts']) == 1
+
+def test_stream_drift_on_empty_window_reports_no_drift():
+    monitor = ModelMonitoring()
+    monitor.add_reference(1.0)
+    result = monitor.monitor_stream_drift()
+    assert np.isnan(result['ks_statistic'])
+    assert result['drift_detected'] is False
+
+def test_stream_window_moments_follow_evictions():
+    monitor = ModelMonitoring()
+    for x in [1e9 + 1, 1e9 + 2, 1e9 + 3, 1e9 + 4]:
+        monitor.add_current(x)
+    monitor.evict(current=2)
+    window = monitor.current_window
+    assert window.mean() == 1e9 + 3.5
+    assert window.std() == 0.5
+
+def test_drift_history_timestamps_match_results():
+    monitor = ModelMonitoring()
+    result = monitor.monitor_data_drift(np.arange(10.0), np.arange(10.0))
+    assert monitor.drift_history[-1]['timestamp'] == result['timestamp']
+    assert isinstance(result['timestamp'], int)
+
+def test_data_drift_keeps_float64_when_float32_would_merge_values():
+    base = 2 ** 24
+    reference = np.array([base + 1, base + 3, base + 5, base + 7], dtype=np.int64)
+    current = np.array([base, base + 2, base + 4, base + 6], dtype=np.int64)
+    result = ModelMonitoring().monitor_data_drift(reference, current)
+    # Interleaved samples differ by a quarter; float32 rounds them onto shared values
+    assert result['ks_statistic'] == 0.25
+
+def test_data_drift_accepts_plain_lists():
+    result = ModelMonitoring().monitor_data_drift([1.0, 2.0, 3.0], [1.0, 2.0, 3.0])
+    assert result['ks_statistic'] == 0.0
+    assert result['drift_detected'] is False